@@ -1907,6 +1907,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 shape.group_id = group_id
             if edit_description:
                 shape.description = description
+            self._canvas_widgets.canvas.mark_shapes_edited([shape])
 
             assert shape.label is not None
             item.setText(
@@ -2263,6 +2264,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 shape.group_id = group_id
                 shape.description = description
                 self.add_label(shape)
+            self._canvas_widgets.canvas.mark_shapes_edited(shapes)
             self._actions.edit_mode.setEnabled(True)
             self._actions.undo_last_point.setEnabled(False)
             self._actions.undo.setEnabled(True)
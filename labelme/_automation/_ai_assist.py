@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+
 import numpy as np
 import osam
 from loguru import logger
@@ -30,9 +32,27 @@ class AiAssistSession:
 
     def _get_session(self) -> OsamSession:
         if self._session is None or self._session.model_name != self.model_name:
+            if self._session is not None:
+                self._session.close()
             self._session = OsamSession(model_name=self.model_name)
         return self._session
 
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def prefetch_embedding(
+        self,
+        *,
+        image: NDArray[np.uint8],
+        image_id: str,
+        on_ready: Callable[[], None],
+    ) -> bool:
+        return self._get_session().prefetch_embedding(
+            image=image, image_id=image_id, on_ready=on_ready
+        )
+
     def propose_shapes(
         self,
         *,
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import collections
+import concurrent.futures
+import threading
+from collections.abc import Callable
 
 import numpy as np
 import osam
@@ -12,6 +15,14 @@ class OsamSession:
     _model_name: str
     _model: osam.types.Model | None
     _embedding_cache: collections.deque[tuple[str, osam.types.ImageEmbedding]]
+    _pending_embeddings: dict[str, concurrent.futures.Future[osam.types.ImageEmbedding]]
+    # Outcome of the last failed encode and the image it was for, so polls do
+    # not keep re-submitting an encode that cannot succeed.
+    _embedding_failure: tuple[str, BaseException] | None
+    _executor: concurrent.futures.ThreadPoolExecutor | None
+    _closed: bool
+    _model_lock: threading.Lock
+    _embedding_lock: threading.Lock
 
     def __init__(
         self,
@@ -22,12 +33,27 @@ class OsamSession:
         self._model_name = model_name
         self._model = None
         self._embedding_cache = collections.deque(maxlen=embedding_cache_size)
+        self._pending_embeddings = {}
+        self._embedding_failure = None
+        self._executor = None
+        self._closed = False
+        self._model_lock = threading.Lock()
+        self._embedding_lock = threading.Lock()
         logger.debug("Initialized OsamSession with model_name={!r}", model_name)
 
     @property
     def model_name(self) -> str:
         return self._model_name
 
+    def close(self) -> None:
+        # Drop queued encodes of a session that is being replaced; one already
+        # running finishes on its worker but no longer calls back.
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending_embeddings.clear()
+
     def run(
         self,
         image: NDArray[np.uint8],
@@ -72,23 +98,100 @@ class OsamSession:
             )
         )
 
+    def prefetch_embedding(
+        self,
+        image: NDArray[np.uint8],
+        image_id: str,
+        on_ready: Callable[[], None],
+    ) -> bool:
+        # Non-blocking counterpart of run()'s embedding step for callers on the
+        # GUI thread: True once run() will not have to encode, otherwise start
+        # encoding on a worker and call on_ready (from that worker) when done.
+        if self._cached_embedding(image_id=image_id) is not None:
+            return True
+        failure = self._embedding_failure
+        if failure is not None and failure[0] == image_id:
+            # Already reported. Models without embeddings run without one;
+            # other failures wait for run() to retry in the foreground.
+            return isinstance(failure[1], NotImplementedError)
+        future = self._pending_embeddings.get(image_id)
+        if future is None:
+            self._embedding_failure = None
+            self._pending_embeddings = {
+                key: pending
+                for key, pending in self._pending_embeddings.items()
+                if not pending.done()
+            }
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="osam-embedding"
+                )
+            future = self._executor.submit(
+                self._compute_embedding, image=image, image_id=image_id
+            )
+            self._pending_embeddings[image_id] = future
+            future.add_done_callback(lambda _: None if self._closed else on_ready())
+            return False
+        if not future.done():
+            return False
+        del self._pending_embeddings[image_id]
+        error = future.exception()
+        if error is None:
+            return True
+        self._embedding_failure = (image_id, error)
+        if isinstance(error, NotImplementedError):
+            return True
+        raise error
+
+    def _cached_embedding(self, image_id: str) -> osam.types.ImageEmbedding | None:
+        # The embedding worker appends while the GUI thread looks up.
+        with self._embedding_lock:
+            for key, embedding in self._embedding_cache:
+                if key == image_id:
+                    return embedding
+        return None
+
     def _get_or_compute_embedding(
         self, image: NDArray[np.uint8], image_id: str
     ) -> osam.types.ImageEmbedding:
-        for key, embedding in self._embedding_cache:
-            if key == image_id:
-                return embedding
+        pending = self._pending_embeddings.pop(image_id, None)
+        if pending is not None:
+            # Let an in-flight background encode finish instead of racing it.
+            concurrent.futures.wait([pending])
+        embedding = self._cached_embedding(image_id=image_id)
+        if embedding is not None:
+            return embedding
+        failure = self._embedding_failure
+        if (
+            failure is not None
+            and failure[0] == image_id
+            and isinstance(failure[1], NotImplementedError)
+        ):
+            raise failure[1]
+        try:
+            embedding = self._compute_embedding(image=image, image_id=image_id)
+        except Exception as e:
+            self._embedding_failure = (image_id, e)
+            raise
+        self._embedding_failure = None
+        return embedding
 
+    def _compute_embedding(
+        self, image: NDArray[np.uint8], image_id: str
+    ) -> osam.types.ImageEmbedding:
         model: osam.types.Model = self._get_or_load_model()
         logger.debug("Computing embedding for cache_key={!r}", image_id)
         embedding: osam.types.ImageEmbedding = model.encode_image(image=image)
-        self._embedding_cache.append((image_id, embedding))
+        with self._embedding_lock:
+            self._embedding_cache.append((image_id, embedding))
         logger.debug("Cached embedding for cache_key={!r}", image_id)
         return embedding
 
     def _get_or_load_model(self) -> osam.types.Model:
-        if self._model is None:
-            logger.debug("Loading model with name={!r}", self._model_name)
-            self._model = osam.apis.get_model_type_by_name(self._model_name)()
-            logger.debug("Loaded model with name={!r}", self._model_name)
-        return self._model
+        # The embedding worker and the GUI thread may both get here first.
+        with self._model_lock:
+            if self._model is None:
+                logger.debug("Loading model with name={!r}", self._model_name)
+                self._model = osam.apis.get_model_type_by_name(self._model_name)()
+                logger.debug("Loaded model with name={!r}", self._model_name)
+            return self._model
@@ -88,7 +88,16 @@ class Shape:
         self.points = self.points + np.asarray(offset, dtype=np.float64).reshape(2)
 
     def copy(self) -> Shape:
-        return copy.deepcopy(self)
+        # Copy field by field: deepcopy's memo walk over the arrays dominates
+        # undo snapshots of large shapes. Only other_data can nest.
+        return dataclasses.replace(
+            self,
+            flags=None if self.flags is None else dict(self.flags),
+            mask=None if self.mask is None else self.mask.copy(),
+            points=self.points.copy(),
+            point_labels=self.point_labels.copy(),
+            other_data=copy.deepcopy(self.other_data),
+        )
 
 
 def nearest_vertex_index(
@@ -135,6 +144,43 @@ def nearest_edge_index(
     return nearest
 
 
+def nearest_vertex_and_edge_index(
+    *,
+    shape: Shape,
+    point: npt.NDArray[np.float64],
+    scale: float,
+    epsilon: float,
+) -> tuple[int | None, int | None]:
+    # Same results as nearest_vertex_index and nearest_edge_index; the
+    # point-to-vertex offsets double as the point-to-edge-start offsets, so
+    # hover answers both from one pass over the points.
+    if len(shape.points) == 0:
+        return None, None
+    offsets = (point - shape.points) * scale
+    vertex_distances = np.hypot(offsets[:, 0], offsets[:, 1])
+    vertex: int | None = None
+    if shape.shape_type not in ("mask", "point"):
+        vertex = int(np.argmin(vertex_distances))
+        if vertex_distances[vertex] > epsilon:
+            vertex = None
+
+    start_offsets = np.roll(offsets, 1, axis=0)
+    segments = start_offsets - offsets
+    length_squared = (segments * segments).sum(axis=1)
+    t = np.clip(
+        (start_offsets * segments).sum(axis=1)
+        / np.where(length_squared == 0, 1.0, length_squared),
+        0.0,
+        1.0,
+    )
+    residuals = start_offsets - t[:, None] * segments
+    edge_distances = np.hypot(residuals[:, 0], residuals[:, 1])
+    edge: int | None = int(np.argmin(edge_distances))
+    if edge_distances[edge] > epsilon:
+        edge = None
+    return vertex, edge
+
+
 def nearest_rotation_point_index(
     *,
     shape: Shape,
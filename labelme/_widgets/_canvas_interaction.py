@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import collections
 import dataclasses
 import enum
+import math
+from collections.abc import Sequence
 from typing import Final
+from typing import TypeAlias
 
 import numpy as np
 import numpy.typing as npt
+from PySide6.QtCore import QRectF
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QMenu
 
 from .._shape import Shape
-from .._shape import nearest_edge_index
 from .._shape import nearest_rotation_point_index
+from .._shape import nearest_vertex_and_edge_index
 from .._shape import nearest_vertex_index
 from ._shape_render import is_hit_by_point
 
@@ -44,13 +49,24 @@ def find_hover_target(
         priority_shape=priority_shape,
     )
 
-    # Pass 1: vertex proximity
+    # Pass 1: vertex proximity; edge hits are kept for pass 3, which only
+    # considers shapes that support adding a point, so only those pay for the
+    # edge distances.
+    edge_hits: list[tuple[Shape, int]] = []
     for shape in candidates:
-        idx = nearest_vertex_index(
-            shape=shape, point=point, scale=scale, epsilon=epsilon
-        )
+        edge_idx: int | None = None
+        if shape.can_add_point():
+            idx, edge_idx = nearest_vertex_and_edge_index(
+                shape=shape, point=point, scale=scale, epsilon=epsilon
+            )
+        else:
+            idx = nearest_vertex_index(
+                shape=shape, point=point, scale=scale, epsilon=epsilon
+            )
         if idx is not None:
             return HitTarget(kind=HitKind.VERTEX, shape=shape, index=idx)
+        if edge_idx is not None:
+            edge_hits.append((shape, edge_idx))
 
     # Pass 2: rotation handle proximity
     for shape in candidates:
@@ -60,13 +76,10 @@ def find_hover_target(
         if idx is not None:
             return HitTarget(kind=HitKind.ROTATION_HANDLE, shape=shape, index=idx)
 
-    # Pass 3: edge proximity (only shapes that support adding a point)
-    for shape in candidates:
-        if not shape.can_add_point():
-            continue
-        idx = nearest_edge_index(shape=shape, point=point, scale=scale, epsilon=epsilon)
-        if idx is not None:
-            return HitTarget(kind=HitKind.EDGE, shape=shape, index=idx)
+    # Pass 3: edge proximity
+    if edge_hits:
+        shape, idx = edge_hits[0]
+        return HitTarget(kind=HitKind.EDGE, shape=shape, index=idx)
 
     # Pass 4: body hit
     for shape in candidates:
@@ -100,6 +113,54 @@ def _build_candidates(
     return candidates
 
 
+SpatialGrid: TypeAlias = dict[tuple[int, int], list[int]]
+
+
+def build_spatial_grid(*, bounds: Sequence[QRectF], cell_size: float) -> SpatialGrid:
+    grid: SpatialGrid = collections.defaultdict(list)
+    for index, rect in enumerate(bounds):
+        for cell in _cells_spanning(
+            left=rect.left(),
+            top=rect.top(),
+            right=rect.right(),
+            bottom=rect.bottom(),
+            cell_size=cell_size,
+        ):
+            grid[cell].append(index)
+    return dict(grid)
+
+
+def query_spatial_grid(
+    *,
+    grid: SpatialGrid,
+    point: npt.NDArray[np.float64],
+    reach: float,
+    cell_size: float,
+) -> list[int]:
+    # Sorted back into insertion order so callers can keep relying on z-order.
+    x, y = float(point[0]), float(point[1])
+    found: set[int] = set()
+    for cell in _cells_spanning(
+        left=x - reach,
+        top=y - reach,
+        right=x + reach,
+        bottom=y + reach,
+        cell_size=cell_size,
+    ):
+        found.update(grid.get(cell, ()))
+    return sorted(found)
+
+
+def _cells_spanning(
+    *, left: float, top: float, right: float, bottom: float, cell_size: float
+) -> list[tuple[int, int]]:
+    return [
+        (cx, cy)
+        for cx in range(math.floor(left / cell_size), math.floor(right / cell_size) + 1)
+        for cy in range(math.floor(top / cell_size), math.floor(bottom / cell_size) + 1)
+    ]
+
+
 def is_within_pick_threshold(
     *,
     a: npt.NDArray[np.float64],
@@ -107,7 +168,7 @@ def is_within_pick_threshold(
     scale: float,
     epsilon: float,
 ) -> bool:
-    return bool(np.linalg.norm(a - b) < epsilon / scale)
+    return math.hypot(a[0] - b[0], a[1] - b[1]) < epsilon / scale
 
 
 class CursorRole(enum.Enum):
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import collections
 import dataclasses
+import math
 import typing
+from collections.abc import Iterable
 from typing import Final
 from typing import Literal
+from typing import TypeAlias
 
 import numpy as np
 import numpy.typing as npt
 import skimage.measure
 from PySide6 import QtCore
 from PySide6 import QtGui
+from PySide6.QtCore import Qt
 
 from .. import _utils
 from .._shape import Shape
@@ -18,6 +23,9 @@ from .._shape import nearest_edge_index
 from .._shape import oriented_rectangle_arrow_points
 
 PEN_WIDTH: Final[int] = 2
+# Enough for every shape of a dense annotation to stay cached across repaints;
+# least recently drawn geometry is evicted first.
+_PATHS_CACHE_SIZE: Final[int] = 4096
 
 
 @dataclasses.dataclass(frozen=True)
@@ -100,6 +108,90 @@ def render_shape(
         _paint_shape_label(painter=painter, shape=shape, context=context)
 
 
+def render_shapes(
+    painter: QtGui.QPainter,
+    items: Iterable[tuple[Shape, ShapeRenderContext]],
+) -> None:
+    # Back-to-front like render_shape, but runs of plain shapes (outline and
+    # vertex markers only) that share a palette and selection state are merged
+    # into one stroke and one vertex fill, instead of one set per shape. Only
+    # shapes drawn entirely in one opaque color are merged: within a run all
+    # outlines then land before all vertex markers and overlaps are covered
+    # once, neither of which is visible when every pixel gets the same color.
+    batch_key: tuple[int, bool] | None = None
+    batch_context: ShapeRenderContext | None = None
+    lines = QtGui.QPainterPath()
+    vertices = QtGui.QPainterPath()
+    for shape, context in items:
+        paths = _batchable_paths(shape=shape, context=context)
+        key = None if paths is None else (id(context.palette), context.selected)
+        if batch_context is not None and key != batch_key:
+            _paint_batch(
+                painter=painter, lines=lines, vertices=vertices, context=batch_context
+            )
+            batch_context = None
+        if paths is None:
+            render_shape(painter=painter, shape=shape, context=context)
+            continue
+        if batch_context is None:
+            batch_key = key
+            batch_context = context
+            lines = QtGui.QPainterPath()
+            vertices = QtGui.QPainterPath()
+            # Shared vertices of neighbouring shapes must not cancel out.
+            vertices.setFillRule(Qt.FillRule.WindingFill)
+        lines.addPath(paths.line)
+        vertices.addPath(paths.vertices)
+    if batch_context is not None:
+        _paint_batch(
+            painter=painter, lines=lines, vertices=vertices, context=batch_context
+        )
+
+
+def _batchable_paths(
+    *, shape: Shape, context: ShapeRenderContext
+) -> _ShapePaths | None:
+    if (
+        shape.mask is not None
+        or len(shape.points) == 0
+        or context.show_label
+        or context.highlight is not None
+        or context.rotation_highlight is not None
+    ):
+        return None
+    if context.fill and shape.shape_type not in ["line", "linestrip", "points"]:
+        return None
+    palette = context.palette
+    line_color = palette.select_line if context.selected else palette.line
+    if line_color.alpha() != 255 or line_color != palette.vertex_fill:
+        return None
+    paths = _get_shape_points_paths(shape=shape, context=context)
+    if (
+        paths.rotation_vertices.length() > 0
+        or paths.orientation_arrow.length() > 0
+        or paths.negative_vertices.length() > 0
+    ):
+        return None
+    return paths
+
+
+def _paint_batch(
+    *,
+    painter: QtGui.QPainter,
+    lines: QtGui.QPainterPath,
+    vertices: QtGui.QPainterPath,
+    context: ShapeRenderContext,
+) -> None:
+    palette = context.palette
+    pen = QtGui.QPen(palette.select_line if context.selected else palette.line)
+    pen.setWidth(PEN_WIDTH)
+    painter.setPen(pen)
+    painter.drawPath(lines)
+    _paint_filled_vertices(
+        painter=painter, path=vertices, highlighted=False, palette=palette
+    )
+
+
 def _paint_shape_label(
     *,
     painter: QtGui.QPainter,
@@ -142,10 +234,11 @@ def _paint_shape_mask(
     path = QtGui.QPainterPath()
     contours = skimage.measure.find_contours(np.pad(shape.mask, pad_width=1))
     for contour in contours:
-        contour = contour + [origin[1], origin[0]]
-        path.moveTo(QtCore.QPointF(contour[0, 1], contour[0, 0]) * context.scale)
-        for point in contour[1:]:
-            path.lineTo(QtCore.QPointF(point[1], point[0]) * context.scale)
+        # (row, col) -> scaled (x, y), converted in one pass.
+        xys = ((contour + [origin[1], origin[0]])[:, ::-1] * context.scale).tolist()
+        path.moveTo(*xys[0])
+        for x, y in xys[1:]:
+            path.lineTo(x, y)
     painter.drawPath(path)
 
 
@@ -171,7 +264,7 @@ def _paint_shape_points(
     context: ShapeRenderContext,
 ) -> None:
     palette = context.palette
-    paths = _build_shape_points_paths(shape=shape, context=context)
+    paths = _get_shape_points_paths(shape=shape, context=context)
 
     painter.drawPath(paths.line)
     _paint_filled_vertices(
@@ -293,6 +386,55 @@ def _build_shape_oriented_rectangle_arrow_path(
     path.lineTo(tip)
 
 
+_PathsCacheKey: TypeAlias = tuple[
+    str,
+    bool,
+    bytes,
+    bytes,
+    float,
+    int,
+    str,
+    VertexHighlight | None,
+    VertexHighlight | None,
+]
+_paths_cache: collections.OrderedDict[_PathsCacheKey, _ShapePaths] = (
+    collections.OrderedDict()
+)
+
+
+def clear_paths_cache() -> None:
+    _paths_cache.clear()
+
+
+def _get_shape_points_paths(
+    *,
+    shape: Shape,
+    context: ShapeRenderContext,
+) -> _ShapePaths:
+    # Keyed on the geometry itself rather than the shape: points are mutated in
+    # place all over the app, so content is the only reliable invalidation.
+    key: _PathsCacheKey = (
+        shape.shape_type,
+        shape.closed,
+        shape.points.tobytes(),
+        shape.point_labels.tobytes() if shape.shape_type == "points" else b"",
+        context.scale,
+        context.point_size,
+        context.point_type,
+        context.highlight,
+        context.rotation_highlight,
+    )
+    paths = _paths_cache.get(key)
+    if paths is not None:
+        _paths_cache.move_to_end(key)
+        return paths
+    paths = _build_shape_points_paths(shape=shape, context=context)
+    _paths_cache[key] = paths
+    if len(_paths_cache) > _PATHS_CACHE_SIZE:
+        _paths_cache.popitem(last=False)
+    return paths
+
+
 def _build_shape_points_paths(
     *,
     shape: Shape,
@@ -301,6 +443,9 @@ def _build_shape_points_paths(
     paths = _ShapePaths()
     scale = context.scale
     points = shape.points
+    # Scale once in NumPy and walk plain floats; per-vertex ndarray indexing
+    # and arithmetic dominates path building for dense polygons.
+    scaled = (points * scale).tolist()
     if shape.shape_type in ["rectangle", "mask"]:
         assert len(points) in [1, 2]
         if len(points) == 2:
@@ -318,13 +463,13 @@ def _build_shape_points_paths(
     elif shape.shape_type == "oriented_rectangle":
         assert len(points) in [1, 2, 4]
         if len(points) == 4:
-            paths.line.moveTo(QtCore.QPointF(*(points[0] * scale)))
-            for i in range(len(points)):
-                paths.line.lineTo(QtCore.QPointF(*(points[i] * scale)))
+            paths.line.moveTo(*scaled[0])
+            for i, (x, y) in enumerate(scaled):
+                paths.line.lineTo(x, y)
                 _build_shape_point_path(
                     path=paths.vertices, shape=shape, context=context, vertex_index=i
                 )
-            paths.line.lineTo(QtCore.QPointF(*(points[0] * scale)))
+            paths.line.lineTo(*scaled[0])
             for i in range(len(points)):
                 _build_shape_rotation_point_path(
                     path=paths.rotation_vertices,
@@ -352,9 +497,9 @@ def _build_shape_points_paths(
                 path=paths.vertices, shape=shape, context=context, vertex_index=i
             )
     elif shape.shape_type == "linestrip":
-        paths.line.moveTo(QtCore.QPointF(*(points[0] * scale)))
-        for i in range(len(points)):
-            paths.line.lineTo(QtCore.QPointF(*(points[i] * scale)))
+        paths.line.moveTo(*scaled[0])
+        for i, (x, y) in enumerate(scaled):
+            paths.line.lineTo(x, y)
             _build_shape_point_path(
                 path=paths.vertices, shape=shape, context=context, vertex_index=i
             )
@@ -366,14 +511,14 @@ def _build_shape_points_paths(
                 path=path, shape=shape, context=context, vertex_index=i
             )
     else:
-        paths.line.moveTo(QtCore.QPointF(*(points[0] * scale)))
-        for i in range(len(points)):
-            paths.line.lineTo(QtCore.QPointF(*(points[i] * scale)))
+        paths.line.moveTo(*scaled[0])
+        for i, (x, y) in enumerate(scaled):
+            paths.line.lineTo(x, y)
             _build_shape_point_path(
                 path=paths.vertices, shape=shape, context=context, vertex_index=i
             )
         if shape.closed:
-            paths.line.lineTo(QtCore.QPointF(*(points[0] * scale)))
+            paths.line.lineTo(*scaled[0])
     return paths
 
 
@@ -407,7 +552,37 @@ def is_hit_by_point(
         ):
             return False
         return bool(shape.mask[raw_y, raw_x])
-    return _build_image_path(shape=shape).contains(QtCore.QPointF(*point))
+    return _contains_point(shape=shape, x=float(point[0]), y=float(point[1]))
+
+
+def _contains_point(*, shape: Shape, x: float, y: float) -> bool:
+    # Mirrors QPainterPath.contains on _build_image_path (odd-even fill,
+    # half-open on the far edges) without building a path per hover.
+    points = shape.points
+    if shape.shape_type in ("rectangle", "mask"):
+        if len(points) != 2:
+            return False
+        (x1, y1), (x2, y2) = points.tolist()
+        return min(x1, x2) <= x < max(x1, x2) and min(y1, y2) <= y < max(y1, y2)
+    if shape.shape_type == "circle":
+        if len(points) != 2:
+            return False
+        (cx, cy), (px, py) = points.tolist()
+        return math.hypot(x - cx, y - cy) <= math.hypot(px - cx, py - cy)
+    if shape.shape_type == "oriented_rectangle" and len(points) != 4:
+        return False
+    if len(points) < 3:
+        return False
+    xs = points[:, 0]
+    ys = points[:, 1]
+    prev_xs = np.roll(xs, 1)
+    prev_ys = np.roll(ys, 1)
+    spans = (ys > y) != (prev_ys > y)
+    if not spans.any():
+        return False
+    xs, ys, prev_xs, prev_ys = xs[spans], ys[spans], prev_xs[spans], prev_ys[spans]
+    crossings = xs + (y - ys) * (prev_xs - xs) / (prev_ys - ys)
+    return bool(np.count_nonzero(x < crossings) % 2)
 
 
 def bounds(*, shape: Shape) -> QtCore.QRectF:
@@ -428,13 +603,15 @@ def _build_image_path(*, shape: Shape) -> QtGui.QPainterPath:
             out.addEllipse(QtCore.QPointF(*points[0]), radius, radius)
     elif shape.shape_type == "oriented_rectangle":
         if len(points) == 4:
-            out.moveTo(QtCore.QPointF(*points[0]))
-            for p in points[1:]:
-                out.lineTo(QtCore.QPointF(*p))
-            out.lineTo(QtCore.QPointF(*points[0]))
+            xys = points.tolist()
+            out.moveTo(*xys[0])
+            for x, y in xys[1:]:
+                out.lineTo(x, y)
+            out.lineTo(*xys[0])
     else:
         if len(points) > 0:
-            out.moveTo(QtCore.QPointF(*points[0]))
-            for p in points[1:]:
-                out.lineTo(QtCore.QPointF(*p))
+            xys = points.tolist()
+            out.moveTo(*xys[0])
+            for x, y in xys[1:]:
+                out.lineTo(x, y)
     return out
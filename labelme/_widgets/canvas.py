@@ -3,8 +3,10 @@ from __future__ import annotations
 import collections
 import dataclasses
 import enum
+import math
 import typing
 from collections.abc import Callable
+from collections.abc import Iterable
 from collections.abc import Sequence
 from typing import Any
 from typing import Final
@@ -30,16 +32,32 @@ from .._shape import ShapeType
 from . import _canvas_interaction
 from ._canvas_interaction import CursorRole
 from ._canvas_interaction import HitKind
+from ._shape_render import PEN_WIDTH
 from ._shape_render import Palette
 from ._shape_render import ShapeRenderContext
 from ._shape_render import VertexHighlight
 from ._shape_render import bounds as _shape_bounds
+from ._shape_render import clear_paths_cache
 from ._shape_render import is_hit_by_point
 from ._shape_render import render_shape
+from ._shape_render import render_shapes
 from .download import download_ai_model
 
 _DEFAULT_SHAPE_RGB: Final[tuple[int, int, int]] = (255, 255, 0)
 _DEFAULT_PALETTE: Final[Palette] = Palette.from_rgb(rgb=_DEFAULT_SHAPE_RGB)
+_SHAPE_GRID_CELL_SIZE: Final[float] = 64.0
+# Beyond this the pre-scaled copy costs more memory than the per-frame
+# resample saves; deep zoom only repaints the visible part anyway.
+_MAX_PRESCALED_PIXMAP_PIXELS: Final[int] = 4096 * 4096
+
+# Resolved once: mouse and key handlers test these on every event, and each
+# enum access is an attribute walk through the Qt bindings.
+_LEFT_BUTTON: Final[Qt.MouseButton] = Qt.MouseButton.LeftButton
+_RIGHT_BUTTON: Final[Qt.MouseButton] = Qt.MouseButton.RightButton
+_MIDDLE_BUTTON: Final[Qt.MouseButton] = Qt.MouseButton.MiddleButton
+_SHIFT_MODIFIER: Final[Qt.KeyboardModifier] = Qt.KeyboardModifier.ShiftModifier
+_CONTROL_MODIFIER: Final[Qt.KeyboardModifier] = Qt.KeyboardModifier.ControlModifier
+_ALT_MODIFIER: Final[Qt.KeyboardModifier] = Qt.KeyboardModifier.AltModifier
 
 
 @dataclasses.dataclass(frozen=True)
@@ -99,8 +117,7 @@ def _shape_to_draft(shape: Shape) -> _DraftShape:
 
 
 MOVE_SPEED: float = 5.0
-POLYGON_HOLD_ADD_INTERVAL_MS: int = 200
-POLYGON_HOLD_MIN_STEP_PX: float = 2.0
+HOVER_REFRESH_INTERVAL_MS: int = 16
 
 _CreateMode = Literal[
     "polygon",
@@ -151,14 +168,22 @@ class _CanvasMode(enum.Enum):
 
 
 class Canvas(QtWidgets.QWidget):
-    pixmap: QtGui.QPixmap
-    _pixmap_hash: int | None
+    _pixmap: QtGui.QPixmap
+    _scale: float
+    _origin_offset: tuple[float, float] | None
+    _image_size: QtCore.QSize
+    _image_width: float
+    _image_height: float
+    # (pixmap cacheKey, RGB array, content id) of the image last sent to AI
+    # assist.
+    _ai_image: tuple[int, np.ndarray, str] | None
     _cursor: CursorRole
-    shapes: list[Shape]
+    _shapes: list[Shape]
     shape_backups: collections.deque[list[Shape]]
     _is_moving_shape: bool
+    _shape_modified: bool
     selected_shapes: list[Shape]
-    _selected_shapes_copy: list[Shape]
+    _drag_copy_offset: QPointF | None
     _current: _DraftShape | None
     hovered_shape: Shape | None
     _last_hovered_shape: Shape | None
@@ -183,6 +208,8 @@ class Canvas(QtWidgets.QWidget):
     mouse_moved = QtCore.Signal(QPointF)
     status_updated = QtCore.Signal(str)
     zoom_rect_selected = QtCore.Signal(QRectF)
+    # Emitted from the embedding worker thread; queued onto the GUI thread.
+    _ai_embedding_ready = QtCore.Signal()
 
     mode: _CanvasMode = _CanvasMode.EDIT
 
@@ -209,6 +236,15 @@ class Canvas(QtWidgets.QWidget):
     _point_type: Literal["square", "round"]
     _draft_palette: Palette
     _palette_cache: dict[str, Palette]
+    _bounds_cache: dict[int, QRectF]
+    _shape_grid: _canvas_interaction.SpatialGrid | None
+    _visible_shapes_cache: list[Shape] | None
+    _prescaled_pixmap: tuple[tuple[int, float], QtGui.QPixmap] | None
+    _ai_preview_cache: tuple[tuple[object, ...], Shape] | None
+    # id(shape) -> (shape, snapshot it was last backed up as). Holding the
+    # shape keeps its id from being reused while the entry exists.
+    _backup_snapshots: dict[int, tuple[Shape, Shape]]
+    _edited_shape_ids: set[int]
 
     _ai_assist_session: _automation.AiAssistSession
 
@@ -239,9 +275,12 @@ class Canvas(QtWidgets.QWidget):
         )
         super().__init__(*args, **kwargs)
         self._left_button_held = False
-        self._polygon_hold_timer = QtCore.QTimer(self)
-        self._polygon_hold_timer.setInterval(POLYGON_HOLD_ADD_INTERVAL_MS)
-        self._polygon_hold_timer.timeout.connect(self._append_held_polygon_point)
+        self._pending_hover_pos: QPointF | None = None
+        self._hover_refresh_timer = QtCore.QTimer(self)
+        self._hover_refresh_timer.setSingleShot(True)
+        self._hover_refresh_timer.setInterval(HOVER_REFRESH_INTERVAL_MS)
+        self._hover_refresh_timer.timeout.connect(self._flush_pending_hover)
+        self._ai_embedding_ready.connect(self._on_ai_embedding_ready)
 
         self._cursor = CursorRole.DEFAULT
         self.reset_state()
@@ -254,16 +293,29 @@ class Canvas(QtWidgets.QWidget):
         self._line = _DraftShape()
         self._prev_point = QPointF()
         self._prev_move_point = QPointF()
+        # Image position of the crosshair as last painted, or None.
+        self._painted_crosshair: QPointF | None = None
         self._drag_anchor = (QPointF(), QRectF())
         self._rotation_center = np.zeros(2)
         self._rotation_initial_angle = 0.0
         self._rotation_original_points = np.empty((0, 2))
-        self.scale: float = 1.0
+        self._scale = 1.0
         self._ai_assist_session = _automation.AiAssistSession()
+        # Background encodes report through _ai_embedding_ready; stop them from
+        # calling back into a deleted canvas.
+        self.destroyed.connect(self._ai_assist_session.close)
         self._ai_inference_failed = False
+        self._ai_preview_cache = None
         self._snapping = True
         self._hovered_shape_is_selected: bool = False
         self._painter = QtGui.QPainter()
+        # Pens for the fixed-style overlays, built once instead of per repaint.
+        self._zoom_rect_pen = QtGui.QPen(
+            QtGui.QColor(0, 120, 215, 200), 2, Qt.PenStyle.DashLine
+        )
+        # A round-capped point of width 5 draws a 2.5px-radius disc.
+        self._center_dot_pen = QtGui.QPen(QtGui.QColor(210, 210, 0), 5.0)
+        self._center_dot_pen.setCapStyle(Qt.PenCapStyle.RoundCap)
         self._pan_anchor = None
         self._zoom_rect_enabled = False
         self._zoom_rect_start: QPointF | None = None
@@ -293,6 +345,43 @@ class Canvas(QtWidgets.QWidget):
         self._show_center_dots = value
         self.update()
 
+    @property
+    def pixmap(self) -> QtGui.QPixmap:
+        return self._pixmap
+
+    @pixmap.setter
+    def pixmap(self, value: QtGui.QPixmap) -> None:
+        # Move and draw paths bounds-check every event; read the size once.
+        self._pixmap = value
+        self._image_size = value.size()
+        self._image_width = float(self._image_size.width())
+        self._image_height = float(self._image_size.height())
+        self._origin_offset = None
+
+    @property
+    def shapes(self) -> list[Shape]:
+        return self._shapes
+
+    @shapes.setter
+    def shapes(self, value: list[Shape]) -> None:
+        # The bounds, grid and visible-shape caches describe the old list.
+        self._shapes = value
+        self._invalidate_bounds()
+
+    @property
+    def scale(self) -> float:
+        return self._scale
+
+    @scale.setter
+    def scale(self, value: float) -> None:
+        if value == self._scale:
+            return
+        self._scale = value
+        self._origin_offset = None
+        # Cached paths are built at a given zoom; drop them rather than keep
+        # a full set per zoom level visited.
+        clear_paths_cache()
+
     @property
     def zoom_rect_enabled(self) -> bool:
         return self._zoom_rect_enabled
@@ -347,8 +436,9 @@ class Canvas(QtWidgets.QWidget):
         self._highlight = None
         self._rotation_highlight = None
 
-    def _render_context(self, shape: Shape, *, highlighted: bool) -> ShapeRenderContext:
-        selected = shape in self.selected_shapes
+    def _render_context(
+        self, shape: Shape, *, highlighted: bool, selected: bool
+    ) -> ShapeRenderContext:
         return ShapeRenderContext(
             scale=self.scale,
             palette=self._resolve_palette(shape.label),
@@ -402,6 +492,9 @@ class Canvas(QtWidgets.QWidget):
         self._reconcile_partial_shape_on_mode_switch(
             old_mode=old_mode, new_mode=new_mode
         )
+        if new_mode not in _AI_CREATE_MODES:
+            # Drop the full-resolution copy kept for AI prompts.
+            self._ai_image = None
 
     def _reconcile_partial_shape_on_mode_switch(
         self, *, old_mode: _CreateMode, new_mode: _CreateMode
@@ -437,24 +530,120 @@ class Canvas(QtWidgets.QWidget):
         self._ai_assist_session.output_format = output_format
 
     def _shapes_from_ai_points(
-        self, points: Sequence[QPointF], point_labels: Sequence[int]
+        self,
+        points: Sequence[QPointF],
+        point_labels: Sequence[int],
+        wait_for_embedding: bool = True,
     ) -> list[Shape]:
-        image: np.ndarray = _utils.img_qt_to_arr(img_qt=self.pixmap.toImage())
+        # Every prompt change lands here; convert and hash the pixmap only once.
+        # The embedding cache is keyed by content so revisiting an image still
+        # hits it.
+        key = self.pixmap.cacheKey()
+        if self._ai_image is None or self._ai_image[0] != key:
+            rgba: np.ndarray = _utils.img_qt_to_arr(img_qt=self.pixmap.toImage())
+            image = np.ascontiguousarray(rgba[:, :, :3])
+            self._ai_image = (key, image, str(hash(rgba.tobytes())))
+        _, image, image_id = self._ai_image
+        # Encoding the image takes seconds; when asked not to wait, propose
+        # nothing until the worker has the embedding and triggers a repaint.
+        if not wait_for_embedding and not self._ai_assist_session.prefetch_embedding(
+            image=image,
+            image_id=image_id,
+            on_ready=self._ai_embedding_ready.emit,
+        ):
+            return []
         return self._ai_assist_session.propose_shapes(
-            image=image[:, :, :3],
-            image_id=str(self._pixmap_hash),
+            image=image,
+            image_id=image_id,
             points=np.array([[p.x(), p.y()] for p in points]),
             point_labels=np.array(point_labels),
             existing_shapes=self.shapes,
         )
 
+    def _on_ai_embedding_ready(self) -> None:
+        # Previews cached while the embedding was pending showed no proposal.
+        self._ai_preview_cache = None
+        self.update()
+
     def _report_inference_failure(self, error: Exception) -> None:
         self._ai_inference_failed = True
         logger.opt(exception=error).error("AI inference failed")
         self.inference_failed.emit(f"{type(error).__name__}: {error}")
 
+    def _cached_bounds(self, shape: Shape) -> QRectF:
+        bounds = self._bounds_cache.get(id(shape))
+        if bounds is None:
+            bounds = _shape_bounds(shape=shape)
+            self._bounds_cache[id(shape)] = bounds
+        return bounds
+
+    def _invalidate_bounds(self, shapes: Iterable[Shape] | None = None) -> None:
+        # Keyed by id(), so any change to the shape list must drop everything:
+        # a new shape may reuse the id of one that was just removed. The grid
+        # indexes into the visible shapes and is rebuilt on the next query
+        # either way.
+        self._shape_grid = None
+        self._cancel_pending_hover()
+        if shapes is None:
+            self._bounds_cache.clear()
+            self._visible_shapes_cache = None
+            return
+        for shape in shapes:
+            self._bounds_cache.pop(id(shape), None)
+
+    def _visible_shapes(self) -> list[Shape]:
+        if self._visible_shapes_cache is None:
+            self._visible_shapes_cache = [s for s in self.shapes if s.visible]
+        return self._visible_shapes_cache
+
+    def _shapes_near(self, pos: QPointF) -> list[Shape]:
+        # Every hover hit (vertex and edge pick radius, point markers) lies
+        # within this many image pixels of the shape's bounds, so anything
+        # farther away can be rejected without the per-point hit-tests.
+        reach = max(self._epsilon, self._point_size / 2) / self.scale
+        visible_shapes = self._visible_shapes()
+        if self._shape_grid is None:
+            self._shape_grid = _canvas_interaction.build_spatial_grid(
+                bounds=[self._cached_bounds(shape) for shape in visible_shapes],
+                cell_size=_SHAPE_GRID_CELL_SIZE,
+            )
+        indices = _canvas_interaction.query_spatial_grid(
+            grid=self._shape_grid,
+            point=np.array([pos.x(), pos.y()]),
+            reach=reach,
+            cell_size=_SHAPE_GRID_CELL_SIZE,
+        )
+        return [
+            shape
+            for shape in (visible_shapes[i] for i in indices)
+            if self._cached_bounds(shape)
+            .adjusted(-reach, -reach, reach, reach)
+            .contains(pos)
+        ]
+
+    def mark_shapes_edited(self, shapes: Iterable[Shape]) -> None:
+        # Every in-place edit of a shape must be reported here before the next
+        # backup_shapes, which copies only the reported shapes.
+        self._edited_shape_ids.update(id(shape) for shape in shapes)
+
     def backup_shapes(self) -> None:
-        self.shape_backups.append([s.copy() for s in self.shapes])
+        self._invalidate_bounds()
+        self._shape_modified = False
+        # Snapshots are never mutated, so a shape not edited since the last
+        # backup shares that snapshot instead of being deep-copied again.
+        backup: list[Shape] = []
+        snapshots: dict[int, tuple[Shape, Shape]] = {}
+        for shape in self.shapes:
+            entry = self._backup_snapshots.get(id(shape))
+            if entry is None or id(shape) in self._edited_shape_ids:
+                snapshot = shape.copy()
+            else:
+                snapshot = entry[1]
+            backup.append(snapshot)
+            snapshots[id(shape)] = (shape, snapshot)
+        self._backup_snapshots = snapshots
+        self._edited_shape_ids = set()
+        self.shape_backups.append(backup)
 
     @property
     def can_restore_shape(self) -> bool:
@@ -471,7 +660,15 @@ class Canvas(QtWidgets.QWidget):
 
         # load_shapes (called downstream by the application) will re-push
         # this entry as the new current state.
-        self.shapes = self.shape_backups.pop()
+        # Hand out copies so editing the restored shapes cannot reach into
+        # snapshots that older backups still share.
+        snapshots = self.shape_backups.pop()
+        self.shapes = [snapshot.copy() for snapshot in snapshots]
+        self._backup_snapshots = {
+            id(shape): (shape, snapshot)
+            for shape, snapshot in zip(self.shapes, snapshots)
+        }
+        self._edited_shape_ids = set()
         self.selected_shapes.clear()
         self.update()
 
@@ -479,9 +676,18 @@ class Canvas(QtWidgets.QWidget):
         self._apply_cursor(self._cursor)
         self._update_status()
 
+    def resizeEvent(self, a0: QtGui.QResizeEvent) -> None:
+        self._origin_offset = None
+        super().resizeEvent(a0)
+
+    def hideEvent(self, a0: QtGui.QHideEvent) -> None:
+        # Resizes of a hidden widget are only delivered once it is shown.
+        self._origin_offset = None
+        super().hideEvent(a0)
+
     def leaveEvent(self, a0: QtCore.QEvent) -> None:
         self._left_button_held = False
-        self._polygon_hold_timer.stop()
+        self._cancel_pending_hover()
         if self._set_highlight(
             hovered_shape=None,
             hovered_edge=None,
@@ -494,14 +700,15 @@ class Canvas(QtWidgets.QWidget):
 
     def focusOutEvent(self, a0: QtGui.QFocusEvent) -> None:
         self._left_button_held = False
-        self._polygon_hold_timer.stop()
         self._release_cursor()
         self._update_status()
 
     def set_editing(self, value: bool = True) -> None:
+        self._cancel_pending_hover()
         self.mode = _CanvasMode.EDIT if value else _CanvasMode.CREATE
         if self.mode == _CanvasMode.EDIT:
             # CREATE -> EDIT
+            self._ai_image = None
             self.update()  # clear crosshair
         else:
             # EDIT -> CREATE
@@ -633,14 +840,36 @@ class Canvas(QtWidgets.QWidget):
             self._track_drawing_cursor(pos=pos, event=event)
             return
         buttons = event.buttons()
-        if buttons & Qt.MouseButton.RightButton:
+        if buttons & _RIGHT_BUTTON:
             self._continue_right_button_drag(pos=pos)
             return
-        if buttons & Qt.MouseButton.LeftButton:
+        if buttons & _LEFT_BUTTON:
             self._continue_left_button_drag(pos=pos, event=event)
             return
+        self._schedule_hover_refresh(pos=pos)
+
+    def _schedule_hover_refresh(self, pos: QPointF) -> None:
+        # Pure hover is the only move path that tolerates latency: run the
+        # first move right away, then coalesce the burst that follows into
+        # at most one hit-test per frame.
+        if self._hover_refresh_timer.isActive():
+            self._pending_hover_pos = pos
+            return
+        self._hover_refresh_timer.start()
+        self._refresh_hover_state(pos=pos)
+
+    def _flush_pending_hover(self) -> None:
+        pos = self._pending_hover_pos
+        if pos is None:
+            return
+        self._pending_hover_pos = None
+        self._hover_refresh_timer.start()
         self._refresh_hover_state(pos=pos)
 
+    def _cancel_pending_hover(self) -> None:
+        self._pending_hover_pos = None
+        self._hover_refresh_timer.stop()
+
     def _advance_pan(self, event: QtGui.QMouseEvent) -> None:
         assert self._pan_anchor is not None
         # Use screen coordinates so the anchor does not drift when our own
@@ -659,13 +888,14 @@ class Canvas(QtWidgets.QWidget):
             )
         self._apply_cursor(CursorRole.DRAW)
         if self._current is None:
-            self.update()
+            self._update_crosshair_region()
             self._update_status()
             return
-        is_shift_pressed = bool(event.modifiers() & Qt.KeyboardModifier.ShiftModifier)
+        is_shift_pressed = bool(event.modifiers() & _SHIFT_MODIFIER)
         pos = self._project_drawing_pos_into_image(pos=pos)
         self._update_drawing_line(pos=pos, is_shift_pressed=is_shift_pressed)
         assert len(self._line.points) == len(self._line.point_labels)
+        self._append_held_polygon_point()
         self.update()
         self._update_status()
 
@@ -683,14 +913,14 @@ class Canvas(QtWidgets.QWidget):
                 corners=current.points,
                 vertex_index=MOVING_CORNER_INDEX,
                 pos=pos,
-                image_size=self.pixmap.size(),
+                image_size=self._image_size,
                 allow_out_of_bounds=self._allow_out_of_bounds_points,
             )
             self._current = dataclasses.replace(current, points=new_corners)
             return self._current.points[MOVING_CORNER_INDEX]
         if self._should_constrain_to_pixmap(pos):
             return _compute_intersection_edges_image(
-                current.points[-1], pos, image_size=self.pixmap.size()
+                current.points[-1], pos, image_size=self._image_size
             )
         if not self._cursor_should_snap_to_polygon_origin(pos=pos):
             return pos
@@ -772,19 +1002,23 @@ class Canvas(QtWidgets.QWidget):
         return pos
 
     def _continue_right_button_drag(self, pos: QPointF) -> None:
-        if self._selected_shapes_copy:
+        # The dragged copy is only an offset over the selection until the
+        # context menu confirms a copy or move in end_move.
+        if self._drag_copy_offset is not None:
             self._apply_cursor(CursorRole.MOVE)
-            self._drag_shapes(shapes=self._selected_shapes_copy, cursor=pos)
+            delta = self._compute_drag_delta(cursor=pos)
+            if delta is not None:
+                self._drag_copy_offset += delta
             self.update()
         elif self.selected_shapes:
-            self._selected_shapes_copy = [s.copy() for s in self.selected_shapes]
+            self._drag_copy_offset = QPointF()
             self.update()
         self._update_status()
 
     def _continue_left_button_drag(
         self, pos: QPointF, event: QtGui.QMouseEvent
     ) -> None:
-        is_shift_pressed = bool(event.modifiers() & Qt.KeyboardModifier.ShiftModifier)
+        is_shift_pressed = bool(event.modifiers() & _SHIFT_MODIFIER)
         if self._is_vertex_selected():
             self._drag_hovered_vertex(pos=pos, is_shift_pressed=is_shift_pressed)
             return
@@ -798,6 +1032,9 @@ class Canvas(QtWidgets.QWidget):
     def _drag_hovered_vertex(self, pos: QPointF, is_shift_pressed: bool) -> None:
         assert self._hovered_vertex is not None
         assert self.hovered_shape is not None
+        # Clamping and snapping can leave the vertex where it was; only a real
+        # change is worth an undo snapshot.
+        previous_points = self.hovered_shape.points.copy()
         self._bounded_move_vertex(
             shape=self.hovered_shape,
             vertex_index=self._hovered_vertex,
@@ -806,6 +1043,9 @@ class Canvas(QtWidgets.QWidget):
         )
         self.update()
         self._is_moving_shape = True
+        if not np.array_equal(previous_points, self.hovered_shape.points):
+            self._shape_modified = True
+            self.mark_shapes_edited([self.hovered_shape])
 
     def _drag_hovered_rotation_point(self, pos: QPointF) -> None:
         assert self.hovered_shape is not None
@@ -815,14 +1055,19 @@ class Canvas(QtWidgets.QWidget):
         current_angle = _utils.direction_angle(
             start=self._rotation_center, end=(pos.x(), pos.y())
         )
+        previous_points = self.hovered_shape.points.copy()
         _shape.rotate(
             shape=self.hovered_shape,
             center=self._rotation_center,
             angle=current_angle - self._rotation_initial_angle,
             source_points=self._rotation_original_points,
         )
+        self._invalidate_bounds(shapes=[self.hovered_shape])
         self.update()
         self._is_moving_shape = True
+        if not np.array_equal(previous_points, self.hovered_shape.points):
+            self._shape_modified = True
+            self.mark_shapes_edited([self.hovered_shape])
 
     def _capture_rotation_anchors(self) -> None:
         assert self.hovered_shape is not None
@@ -840,13 +1085,15 @@ class Canvas(QtWidgets.QWidget):
 
     def _drag_selected_shapes(self, pos: QPointF) -> None:
         self._apply_cursor(CursorRole.MOVE)
-        self._drag_shapes(shapes=self.selected_shapes, cursor=pos)
+        if self._drag_shapes(shapes=self.selected_shapes, cursor=pos):
+            self._shape_modified = True
         self.update()
         self._is_moving_shape = True
 
     def _highlight_hover_shape(self, pos: QPointF, status_messages: list[str]) -> None:
+        previous_shape = self.hovered_shape
         target = _canvas_interaction.find_hover_target(
-            shapes=self.shapes,
+            shapes=self._shapes_near(pos),
             point=np.array([pos.x(), pos.y()]),
             scale=self.scale,
             epsilon=self._epsilon,
@@ -862,7 +1109,7 @@ class Canvas(QtWidgets.QWidget):
                 hovered_vertex=None,
                 hovered_rotation=None,
             ):
-                self.update()
+                self._update_shapes_region(shapes=[previous_shape])
             return
 
         if target.kind is HitKind.VERTEX:
@@ -878,7 +1125,7 @@ class Canvas(QtWidgets.QWidget):
             status_messages.append(self.tr("Click & drag to move point"))
             if target.shape.can_remove_point():
                 status_messages.append(self.tr("ALT + SHIFT + Click to delete point"))
-            self.update()
+            self._update_shapes_region(shapes=[previous_shape, target.shape])
             return
 
         if target.kind is HitKind.ROTATION_HANDLE:
@@ -892,7 +1139,7 @@ class Canvas(QtWidgets.QWidget):
             self._highlight_rotation_point(index=target.index, mode="move")
             self._apply_cursor(CursorRole.HANDLE)
             status_messages.append(self.tr("Click & drag to rotate the shape"))
-            self.update()
+            self._update_shapes_region(shapes=[previous_shape, target.shape])
             return
 
         if target.kind is HitKind.EDGE:
@@ -905,7 +1152,7 @@ class Canvas(QtWidgets.QWidget):
             )
             self._apply_cursor(CursorRole.HANDLE)
             status_messages.append(self.tr("ALT + Click to create point on shape"))
-            self.update()
+            self._update_shapes_region(shapes=[previous_shape, target.shape])
             return
 
         if target.kind is HitKind.BODY:
@@ -922,11 +1169,30 @@ class Canvas(QtWidgets.QWidget):
                 ]
             )
             self._apply_cursor(CursorRole.GRAB)
-            self.update()
+            self._update_shapes_region(shapes=[previous_shape, target.shape])
             return
 
         typing.assert_never(target.kind)
 
+    def _update_shapes_region(self, shapes: Iterable[Shape | None]) -> None:
+        # Hover only restyles the shapes it leaves and enters, so repaint just
+        # their bounds, padded for the outline and the largest vertex marker
+        # (a "near" highlight is drawn at 4x the point size). Labels are drawn
+        # outside the bounds; fall back to a full repaint.
+        if self._show_labels:
+            self.update()
+            return
+        for shape in shapes:
+            if shape is not None:
+                self._update_image_rect(self._cached_bounds(shape))
+
+    def _update_image_rect(self, bounds: QRectF) -> None:
+        # Repaint an image-space rect in widget space, padded as above.
+        bounds = bounds.translated(self._compute_image_origin_offset())
+        rect = QRectF(bounds.topLeft() * self.scale, bounds.bottomRight() * self.scale)
+        margin = self._point_size * 2 + PEN_WIDTH
+        self.update(rect.adjusted(-margin, -margin, margin, margin).toAlignedRect())
+
     def add_point_to_edge(self) -> None:
         shape = self._last_hovered_shape
         index = self._last_hovered_edge
@@ -934,11 +1200,14 @@ class Canvas(QtWidgets.QWidget):
         if shape is None or index is None or point is None:
             return
         shape.insert_point(index, (point.x(), point.y()))
+        self._invalidate_bounds(shapes=[shape])
+        self.mark_shapes_edited([shape])
         self._highlight_vertex(index=index, mode="move")
         self.hovered_shape = shape
         self._hovered_vertex = index
         self._hovered_edge = None
         self._is_moving_shape = True
+        self._shape_modified = True
         # Repaint now; otherwise the edit is invisible until the next mouse move.
         self.update()
 
@@ -948,6 +1217,8 @@ class Canvas(QtWidgets.QWidget):
         if shape is None or index is None or not shape.can_remove_point():
             return False
         shape.remove_point(index)
+        self._invalidate_bounds(shapes=[shape])
+        self.mark_shapes_edited([shape])
         self._clear_highlight_state()
         # Drop the hovered vertex and selection so the press that deleted the
         # point cannot also drag the adjacent vertex (#968) or the whole shape.
@@ -956,18 +1227,25 @@ class Canvas(QtWidgets.QWidget):
         self._hovered_vertex = None
         self._last_hovered_vertex = None
         self._is_moving_shape = True  # commit the removal on release
+        self._shape_modified = True
         # Repaint now; otherwise the edit is invisible until the next mouse move.
         self.update()
         return True
 
     def mousePressEvent(self, a0: QtGui.QMouseEvent) -> None:
-        pos: QPointF = self._transform_point_widget_to_image(a0.position())
-        self._dispatch_pointer_press(pos=pos, event=a0)
+        # Presses act on the hover highlight, so it must reflect the cursor.
+        pending_hover_pos = self._pending_hover_pos
+        self._cancel_pending_hover()
+        if pending_hover_pos is not None:
+            self._refresh_hover_state(pos=pending_hover_pos)
+        self._dispatch_pointer_press(event=a0)
         self._update_status()
 
-    def _dispatch_pointer_press(self, pos: QPointF, event: QtGui.QMouseEvent) -> None:
+    def _dispatch_pointer_press(self, event: QtGui.QMouseEvent) -> None:
+        # Only the left and right button paths work in image coordinates, so
+        # zoom-rect and pan presses skip the widget-to-image transform.
         button = event.button()
-        if button == Qt.MouseButton.LeftButton:
+        if button == _LEFT_BUTTON:
             self._left_button_held = True
             if self._zoom_rect_enabled:
                 self._zoom_rect_start = event.position()
@@ -975,25 +1253,22 @@ class Canvas(QtWidgets.QWidget):
                 self._apply_cursor(CursorRole.DRAW)
                 self.update()
                 return
-            self._press_left(pos=pos, event=event)
-            if (
-                self.mode == _CanvasMode.CREATE
-                and self.create_mode == "polygon"
-                and self._current is not None
-            ):
-                self._polygon_hold_timer.start()
+            self._press_left(
+                pos=self._transform_point_widget_to_image(event.position()),
+                event=event,
+            )
             return
-        if button == Qt.MouseButton.RightButton and self.mode == _CanvasMode.EDIT:
-            self._press_right(pos=pos, event=event)
+        if button == _RIGHT_BUTTON and self.mode == _CanvasMode.EDIT:
+            self._press_right(
+                pos=self._transform_point_widget_to_image(event.position()),
+                event=event,
+            )
             return
-        if (
-            button == Qt.MouseButton.MiddleButton
-            and self._is_image_overflowing_viewport()
-        ):
+        if button == _MIDDLE_BUTTON and self._is_image_overflowing_viewport():
             self._begin_pan(event=event)
 
     def _press_left(self, pos: QPointF, event: QtGui.QMouseEvent) -> None:
-        is_shift_pressed = bool(event.modifiers() & Qt.KeyboardModifier.ShiftModifier)
+        is_shift_pressed = bool(event.modifiers() & _SHIFT_MODIFIER)
         if self.mode == _CanvasMode.CREATE:
             self._press_left_while_drawing(
                 pos=pos, event=event, is_shift_pressed=is_shift_pressed
@@ -1044,7 +1319,7 @@ class Canvas(QtWidgets.QWidget):
             self._line = dataclasses.replace(
                 self._line, points=(current.points[-1],) + self._line.points[1:]
             )
-            if modifiers == Qt.KeyboardModifier.ControlModifier:
+            if modifiers == _CONTROL_MODIFIER:
                 self._finalize()
         elif mode == "ai_points_to_shape":
             current = current.add_point(
@@ -1056,7 +1331,7 @@ class Canvas(QtWidgets.QWidget):
                 points=(current.points[-1],) + self._line.points[1:],
                 point_labels=(current.point_labels[-1],) + self._line.point_labels[1:],
             )
-            if modifiers & Qt.KeyboardModifier.ControlModifier:
+            if modifiers & _CONTROL_MODIFIER:
                 self._finalize()
 
     def _lock_oriented_rectangle_first_edge(self, current: _DraftShape) -> None:
@@ -1102,10 +1377,7 @@ class Canvas(QtWidgets.QWidget):
         if mode == "point":
             self._finalize()
             return
-        if (
-            mode == "ai_points_to_shape"
-            and event.modifiers() & Qt.KeyboardModifier.ControlModifier
-        ):
+        if mode == "ai_points_to_shape" and event.modifiers() & _CONTROL_MODIFIER:
             self._finalize()
             return
 
@@ -1128,7 +1400,7 @@ class Canvas(QtWidgets.QWidget):
             self._capture_rotation_anchors()
         self._select_shape_point(
             pos,
-            multiple_selection_mode=modifiers == Qt.KeyboardModifier.ControlModifier,
+            multiple_selection_mode=modifiers == _CONTROL_MODIFIER,
         )
         self._prev_point = pos
         self.update()
@@ -1137,11 +1409,11 @@ class Canvas(QtWidgets.QWidget):
         # Returns True only when the press is consumed as a terminal edit (a point
         # removal), so the caller skips point selection and starts no drag. Adding
         # a point intentionally falls through so the new vertex can be dragged.
-        if self._is_edge_selected() and modifiers == Qt.KeyboardModifier.AltModifier:
+        if self._is_edge_selected() and modifiers == _ALT_MODIFIER:
             self.add_point_to_edge()
             return False
         if self._is_vertex_selected() and modifiers == (
-            Qt.KeyboardModifier.AltModifier | Qt.KeyboardModifier.ShiftModifier
+            _ALT_MODIFIER | _SHIFT_MODIFIER
         ):
             return self.remove_selected_point()
         return False
@@ -1152,8 +1424,7 @@ class Canvas(QtWidgets.QWidget):
         ):
             self._select_shape_point(
                 pos,
-                multiple_selection_mode=event.modifiers()
-                == Qt.KeyboardModifier.ControlModifier,
+                multiple_selection_mode=event.modifiers() == _CONTROL_MODIFIER,
             )
             self.update()
         self._prev_point = pos
@@ -1169,23 +1440,22 @@ class Canvas(QtWidgets.QWidget):
 
     def _dispatch_pointer_release(self, event: QtGui.QMouseEvent) -> None:
         button = event.button()
-        if button == Qt.MouseButton.RightButton:
+        if button == _RIGHT_BUTTON:
             self._release_right(event=event)
             return
-        if button == Qt.MouseButton.LeftButton:
+        if button == _LEFT_BUTTON:
             self._left_button_held = False
-            self._polygon_hold_timer.stop()
             if self._zoom_rect_start is not None:
                 self._finish_zoom_rect()
                 return
             self._release_left()
             return
-        if button == Qt.MouseButton.MiddleButton:
+        if button == _MIDDLE_BUTTON:
             self._finish_pan()
 
     def _release_right(self, event: QtGui.QMouseEvent) -> None:
         menu = self.context_menus.menu_for(
-            has_selection=len(self._selected_shapes_copy) > 0
+            has_selection=self._drag_copy_offset is not None
         )
         self._release_cursor()
         self.context_menu_origin = self.mapToGlobal(event.position().toPoint())
@@ -1195,9 +1465,9 @@ class Canvas(QtWidgets.QWidget):
             self.context_menu_origin = None
         if triggered:
             return
-        if not self._selected_shapes_copy:
+        if self._drag_copy_offset is None:
             return
-        self._selected_shapes_copy.clear()
+        self._drag_copy_offset = None
         self.update()
 
     def _release_left(self) -> None:
@@ -1239,17 +1509,13 @@ class Canvas(QtWidgets.QWidget):
             or current is None
             or len(self._line.points) < 2
         ):
-            self._polygon_hold_timer.stop()
             return
         point = self._line.points[1]
-        min_step = POLYGON_HOLD_MIN_STEP_PX / self.scale
+        # Dragging with the button held traces the outline; space the points
+        # by twice the pick radius so they do not pile up under the cursor.
+        min_step = 2 * self._epsilon / self.scale
         previous = current.points[-1]
-        if (
-            np.linalg.norm(
-                np.array([point.x() - previous.x(), point.y() - previous.y()])
-            )
-            < min_step
-        ):
+        if math.hypot(point.x() - previous.x(), point.y() - previous.y()) < min_step:
             return
         current = current.add_point(point, autoclose=True)
         self._current = current
@@ -1258,8 +1524,6 @@ class Canvas(QtWidgets.QWidget):
         )
         if current.closed:
             self._finalize()
-        else:
-            self.update()
 
     def _is_image_overflowing_viewport(self) -> bool:
         if self.pixmap.isNull():
@@ -1267,8 +1531,8 @@ class Canvas(QtWidgets.QWidget):
         viewport = self._scroll_viewport()
         if viewport is None:
             return False
-        scaled_w = self.pixmap.width() * self.scale
-        scaled_h = self.pixmap.height() * self.scale
+        scaled_w = self._image_width * self.scale
+        scaled_h = self._image_height * self.scale
         return scaled_w > viewport.width() or scaled_h > viewport.height()
 
     def _scroll_viewport(self) -> QtWidgets.QWidget | None:
@@ -1291,34 +1555,34 @@ class Canvas(QtWidgets.QWidget):
         )
         if moved is None:
             return
-        index = self.shapes.index(moved)
-        if not np.array_equal(
-            self.shape_backups[-1][index].points, self.shapes[index].points
-        ):
+        if self._shape_modified:
             self.backup_shapes()
             self.shape_moved.emit()
         self._is_moving_shape = False
 
     def end_move(self, copy: bool) -> bool:
-        assert self.selected_shapes and self._selected_shapes_copy
-        assert len(self._selected_shapes_copy) == len(self.selected_shapes)
+        assert self.selected_shapes and self._drag_copy_offset is not None
+        offset = (self._drag_copy_offset.x(), self._drag_copy_offset.y())
         if copy:
-            self._apply_copy_move()
+            self._apply_copy_move(offset=offset)
         else:
-            self._apply_in_place_move()
-        self._selected_shapes_copy.clear()
+            self._apply_in_place_move(offset=offset)
+        self._drag_copy_offset = None
         self.update()
         self.backup_shapes()
         return True
 
-    def _apply_copy_move(self) -> None:
-        for i, clone in enumerate(self._selected_shapes_copy):
+    def _apply_copy_move(self, offset: tuple[float, float]) -> None:
+        for i, original in enumerate(self.selected_shapes):
+            clone = original.copy()
+            clone.translate(offset=offset)
             self.shapes.append(clone)
             self.selected_shapes[i] = clone
 
-    def _apply_in_place_move(self) -> None:
-        for original, clone in zip(self.selected_shapes, self._selected_shapes_copy):
-            original.points = clone.points
+    def _apply_in_place_move(self, offset: tuple[float, float]) -> None:
+        for original in self.selected_shapes:
+            original.translate(offset=offset)
+        self.mark_shapes_edited(self.selected_shapes)
 
     def _can_close_shape(self) -> bool:
         if self.mode != _CanvasMode.CREATE:
@@ -1381,8 +1645,8 @@ class Canvas(QtWidgets.QWidget):
 
     def _find_shape_at_point(self, point: QPointF) -> Shape | None:
         query = np.array([point.x(), point.y()])
-        for shape in reversed(self.shapes):
-            if shape.visible and is_hit_by_point(
+        for shape in reversed(self._shapes_near(point)):
+            if is_hit_by_point(
                 shape=shape,
                 point=query,
                 scale=self.scale,
@@ -1396,9 +1660,12 @@ class Canvas(QtWidgets.QWidget):
         if not self.selected_shapes:
             self._drag_anchor = (QPointF(), QRectF())
             return
-        bounds = _shape_bounds(shape=self.selected_shapes[0])
-        for s in self.selected_shapes[1:]:
-            bounds = bounds.united(_shape_bounds(shape=s))
+        coords = np.array(
+            [self._cached_bounds(shape).getCoords() for shape in self.selected_shapes]
+        )
+        left, top = coords[:, :2].min(axis=0)
+        right, bottom = coords[:, 2:].max(axis=0)
+        bounds = QRectF(QPointF(left, top), QPointF(right, bottom))
         self._drag_anchor = (bounds.topLeft() - click, bounds)
 
     def _bounded_move_vertex(
@@ -1416,6 +1683,7 @@ class Canvas(QtWidgets.QWidget):
             )
             return
 
+        self._invalidate_bounds(shapes=[shape])
         if shape.shape_type == "oriented_rectangle":
             self._bounded_move_oriented_rectangle_vertex(
                 shape=shape, vertex_index=vertex_index, pos=pos
@@ -1424,7 +1692,7 @@ class Canvas(QtWidgets.QWidget):
 
         if self._should_constrain_to_pixmap(pos):
             pos = _compute_intersection_edges_image(
-                QPointF(*shape.points[vertex_index]), pos, image_size=self.pixmap.size()
+                QPointF(*shape.points[vertex_index]), pos, image_size=self._image_size
             )
 
         if is_shift_pressed and shape.shape_type == "rectangle":
@@ -1443,35 +1711,40 @@ class Canvas(QtWidgets.QWidget):
             corners=corners,
             vertex_index=vertex_index,
             pos=pos,
-            image_size=self.pixmap.size(),
+            image_size=self._image_size,
             allow_out_of_bounds=self._allow_out_of_bounds_points,
         )
         for i, corner in enumerate(new_corners):
             shape.move_vertex(i=i, pos=(corner.x(), corner.y()))
 
     def _drag_shapes(self, shapes: list[Shape], cursor: QPointF) -> bool:
-        if self._should_constrain_to_pixmap(cursor):
+        delta = self._compute_drag_delta(cursor=cursor)
+        if delta is None:
             return False
+        for shape in shapes:
+            shape.translate(offset=(delta.x(), delta.y()))
+        self._invalidate_bounds(shapes=shapes)
+        self.mark_shapes_edited(shapes)
+        return True
+
+    def _compute_drag_delta(self, cursor: QPointF) -> QPointF | None:
+        if self._should_constrain_to_pixmap(cursor):
+            return None
 
         rel_tl, bounds = self._drag_anchor
         target = cursor + rel_tl
         if not self._allow_out_of_bounds_points:
-            pw = float(self.pixmap.width())
-            ph = float(self.pixmap.height())
             target.setX(max(0.0, target.x()))
             target.setY(max(0.0, target.y()))
-            target.setX(min(target.x(), pw - bounds.width()))
-            target.setY(min(target.y(), ph - bounds.height()))
+            target.setX(min(target.x(), self._image_width - bounds.width()))
+            target.setY(min(target.y(), self._image_height - bounds.height()))
 
         new_cursor = target - rel_tl
         delta = new_cursor - self._prev_point
         if delta.isNull():
-            return False
-
-        for shape in shapes:
-            shape.translate(offset=(delta.x(), delta.y()))
+            return None
         self._prev_point = new_cursor
-        return True
+        return delta
 
     def deselect_shape(self) -> bool:
         if not self.selected_shapes:
@@ -1502,27 +1775,18 @@ class Canvas(QtWidgets.QWidget):
             super().paintEvent(a0)
             return
         self._render_canvas()
-        self._draw_zoom_rect_overlay()
         if self._current is not None:
             self._clear_highlight_state()
 
-    def _draw_zoom_rect_overlay(self) -> None:
+    def _draw_zoom_rect_overlay(self, painter: QtGui.QPainter) -> None:
         if self._zoom_rect_start is None or self._zoom_rect_end is None:
             return
-        painter = QtGui.QPainter(self)
-        try:
-            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
-            painter.setPen(
-                QtGui.QPen(
-                    QtGui.QColor(0, 120, 215, 200),
-                    2,
-                    Qt.PenStyle.DashLine,
-                )
-            )
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawRect(QRectF(self._zoom_rect_start, self._zoom_rect_end))
-        finally:
-            painter.end()
+        # The rubber band is tracked in widget coordinates, so drop the image
+        # offset the layers were drawn with.
+        painter.resetTransform()
+        painter.setPen(self._zoom_rect_pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(QRectF(self._zoom_rect_start, self._zoom_rect_end))
 
     def _render_canvas(self) -> None:
         self._palette_cache.clear()
@@ -1532,15 +1796,18 @@ class Canvas(QtWidgets.QWidget):
             self._setup_world_transform(painter=painter)
             for layer in self._render_layers():
                 layer(painter)
+            self._draw_zoom_rect_overlay(painter=painter)
         finally:
             painter.end()
 
     def _setup_world_transform(self, painter: QtGui.QPainter) -> None:
-        for hint in (
-            QtGui.QPainter.RenderHint.Antialiasing,
-            QtGui.QPainter.RenderHint.SmoothPixmapTransform,
-        ):
-            painter.setRenderHint(hint)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        # When image pixels map 1:1 onto device pixels the pixmap is blitted
+        # as-is and filtering would only cost time.
+        device_scale = self.scale * painter.device().devicePixelRatioF()
+        painter.setRenderHint(
+            QtGui.QPainter.RenderHint.SmoothPixmapTransform, device_scale != 1.0
+        )
         painter.translate(self._compute_image_origin_offset() * self.scale)
 
     def _render_layers(self) -> tuple[Callable[[QtGui.QPainter], None], ...]:
@@ -1556,19 +1823,69 @@ class Canvas(QtWidgets.QWidget):
         )
 
     def _draw_pixmap_layer(self, painter: QtGui.QPainter) -> None:
+        prescaled = self._get_prescaled_pixmap(dpr=painter.device().devicePixelRatioF())
+        if prescaled is not None:
+            # The device pixel ratio makes the pixmap draw at its logical size.
+            painter.drawPixmap(QPointF(0.0, 0.0), prescaled)
+            return
         target = QtCore.QRectF(
             0.0,
             0.0,
-            self.pixmap.width() * self.scale,
-            self.pixmap.height() * self.scale,
+            self._image_width * self.scale,
+            self._image_height * self.scale,
         )
         painter.drawPixmap(target, self.pixmap, QtCore.QRectF(self.pixmap.rect()))
 
+    def _get_prescaled_pixmap(self, dpr: float) -> QtGui.QPixmap | None:
+        # Only downscaling benefits from a cached copy: upscaling would hold a
+        # pixmap larger than the image and cost a full smooth rescale per zoom.
+        # Render at device pixels so HiDPI screens do not resample it again.
+        device_scale = self.scale * dpr
+        if device_scale >= 1.0:
+            return None
+        width = round(self._image_width * device_scale)
+        height = round(self._image_height * device_scale)
+        if not 0 < width * height <= _MAX_PRESCALED_PIXMAP_PIXELS:
+            return None
+        key = (self.pixmap.cacheKey(), device_scale)
+        if self._prescaled_pixmap is None or self._prescaled_pixmap[0] != key:
+            self._prescaled_pixmap = (
+                key,
+                self.pixmap.scaled(
+                    width,
+                    height,
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                ),
+            )
+            self._prescaled_pixmap[1].setDevicePixelRatio(dpr)
+        return self._prescaled_pixmap[1]
+
+    def _update_crosshair_region(self) -> None:
+        # With no shape in progress only the crosshair follows the cursor, so
+        # repaint the rows and columns of its old and new lines.
+        cursor = self._prev_move_point
+        targets = [self._painted_crosshair]
+        if self._should_draw_crosshair(cursor=cursor):
+            targets.append(cursor)
+        offset_x, offset_y = self._image_origin_offset_xy()
+        width = self.width()
+        height = self.height()
+        for point in targets:
+            if point is None:
+                continue
+            x = int((point.x() + offset_x) * self.scale)
+            y = int((point.y() + offset_y) * self.scale)
+            self.update(QtCore.QRect(0, y - 2, width, 5))
+            self.update(QtCore.QRect(x - 2, 0, 5, height))
+
     def _draw_crosshair_layer(self, painter: QtGui.QPainter) -> None:
         cursor: QPointF | None = self._prev_move_point
+        self._painted_crosshair = None
         if not self._should_draw_crosshair(cursor=cursor):
             return
         assert cursor is not None
+        self._painted_crosshair = cursor
         painter.setPen(self.palette().color(QtGui.QPalette.ColorRole.WindowText))
         cx = int(cursor.x() * self.scale)
         cy = int(cursor.y() * self.scale)
@@ -1583,33 +1900,30 @@ class Canvas(QtWidgets.QWidget):
             bottom = int(-offset.y() + area.height())
         else:
             left = top = 0
-            right = int(self.pixmap.width() * self.scale) - 1
-            bottom = int(self.pixmap.height() * self.scale) - 1
+            right = int(self._image_width * self.scale) - 1
+            bottom = int(self._image_height * self.scale) - 1
         painter.drawLine(left, cy, right, cy)
         painter.drawLine(cx, top, cx, bottom)
 
     def _draw_center_dots_layer(self, painter: QtGui.QPainter) -> None:
         if not self._show_center_dots:
             return
-        painter.save()
-        try:
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(QtGui.QColor(210, 210, 0))
-            radius = 2.5
-            for shape in self.shapes:
-                if not shape.visible or shape.shape_type not in (
-                    "rectangle",
-                    "oriented_rectangle",
-                    "polygon",
-                ):
-                    continue
-                points = np.asarray(shape.points, dtype=float)
-                if len(points) == 0:
-                    continue
-                center = points.mean(axis=0) * self.scale
-                painter.drawEllipse(QPointF(*center), radius, radius)
-        finally:
-            painter.restore()
+        centers = [
+            shape.points.mean(axis=0)
+            for shape in self._visible_shapes()
+            if shape.shape_type in ("rectangle", "oriented_rectangle", "polygon")
+            and len(shape.points) > 0
+        ]
+        if not centers:
+            return
+        # Only the pen changes, and every later layer sets its own pen, so no
+        # save()/restore() of the whole painter state is needed.
+        painter.setPen(self._center_dot_pen)
+        painter.drawPoints(
+            QtGui.QPolygonF(
+                [QPointF(x, y) for x, y in (np.asarray(centers) * self.scale).tolist()]
+            )
+        )
 
     def _should_draw_crosshair(self, cursor: QPointF | None) -> bool:
         if self.mode != _CanvasMode.CREATE:
@@ -1621,13 +1935,24 @@ class Canvas(QtWidgets.QWidget):
         return not self._should_constrain_to_pixmap(cursor)
 
     def _draw_committed_shapes_layer(self, painter: QtGui.QPainter) -> None:
-        for shape in self.shapes:
-            if not shape.visible:
-                continue
-            context = self._render_context(
-                shape=shape, highlighted=shape is self.hovered_shape
-            )
-            render_shape(painter=painter, shape=shape, context=context)
+        # Resolve selection once per paint; a list membership test per shape
+        # would make the loop quadratic with a large selection.
+        selected_ids = {id(shape) for shape in self.selected_shapes}
+        hovered = self.hovered_shape
+        render_shapes(
+            painter=painter,
+            items=(
+                (
+                    shape,
+                    self._render_context(
+                        shape=shape,
+                        highlighted=shape is hovered,
+                        selected=id(shape) in selected_ids,
+                    ),
+                )
+                for shape in self._visible_shapes()
+            ),
+        )
 
     def _draw_active_shape_layer(self, painter: QtGui.QPainter) -> None:
         if self._current is None:
@@ -1637,19 +1962,26 @@ class Canvas(QtWidgets.QWidget):
         self._render_draft(painter=painter, draft=self._line, highlighted=False)
 
     def _draw_drag_copy_layer(self, painter: QtGui.QPainter) -> None:
-        for copy_shape in self._selected_shapes_copy:
-            context = ShapeRenderContext(
-                scale=self.scale,
-                palette=self._resolve_palette(copy_shape.label),
-                point_size=self._point_size,
-                point_type=self._point_type,
-                selected=True,
-                fill=True,
-                highlight=None,
-                rotation_highlight=None,
-                show_label=self._show_labels,
-            )
-            render_shape(painter=painter, shape=copy_shape, context=context)
+        if self._drag_copy_offset is None:
+            return
+        painter.save()
+        try:
+            painter.translate(self._drag_copy_offset * self.scale)
+            for shape in self.selected_shapes:
+                context = ShapeRenderContext(
+                    scale=self.scale,
+                    palette=self._resolve_palette(shape.label),
+                    point_size=self._point_size,
+                    point_type=self._point_type,
+                    selected=True,
+                    fill=True,
+                    highlight=None,
+                    rotation_highlight=None,
+                    show_label=self._show_labels,
+                )
+                render_shape(painter=painter, shape=shape, context=context)
+        finally:
+            painter.restore()
 
     def _draw_preview_overlay_layer(self, painter: QtGui.QPainter) -> None:
         preview = self._build_preview_shape()
@@ -1695,10 +2027,24 @@ class Canvas(QtWidgets.QWidget):
             point=self._line.points[1],
             label=self._line.point_labels[1],
         )
+        # Repaints that leave the prompt, image and existing shapes unchanged
+        # (hover, scroll, status updates) reuse the last proposal instead of
+        # running SAM again.
+        key = (
+            tuple((point.x(), point.y()) for point in preview.points),
+            preview.point_labels,
+            self.pixmap.cacheKey(),
+            self._ai_assist_session.model_name,
+            self._ai_assist_session.output_format,
+            tuple(id(shape) for shape in self.shapes),
+        )
+        if self._ai_preview_cache is not None and self._ai_preview_cache[0] == key:
+            return self._ai_preview_cache[1]
         try:
             ai_shapes = self._shapes_from_ai_points(
                 points=preview.points,
                 point_labels=preview.point_labels,
+                wait_for_embedding=False,
             )
         except Exception as e:
             # This runs inside paintEvent on every repaint, so a persistently
@@ -1708,26 +2054,37 @@ class Canvas(QtWidgets.QWidget):
                 self._report_inference_failure(error=e)
             return _draft_to_shape(preview)
         self._ai_inference_failed = False
-        if ai_shapes:
-            return ai_shapes[0]
-        return _draft_to_shape(preview)
+        shape = ai_shapes[0] if ai_shapes else _draft_to_shape(preview)
+        self._ai_preview_cache = (key, shape)
+        return shape
 
     def _transform_point_widget_to_image(self, point: QPointF) -> QPointF:
-        origin = self._compute_image_origin_offset()
-        image_x = point.x() / self.scale - origin.x()
-        image_y = point.y() / self.scale - origin.y()
-        return QPointF(image_x, image_y)
+        # Runs on every pointer event: stay in Python floats and build a single
+        # QPointF rather than chaining QPointF arithmetic.
+        scale = self.scale
+        offset_x, offset_y = self._image_origin_offset_xy()
+        return QPointF(point.x() / scale - offset_x, point.y() / scale - offset_y)
 
     def _compute_image_origin_offset(self) -> QPointF:
+        return QPointF(*self._image_origin_offset_xy())
+
+    def _image_origin_offset_xy(self) -> tuple[float, float]:
+        # Only resizing, zooming or a new pixmap moves the origin; each of
+        # those drops the cached offset. A hidden widget is not told about
+        # resizes until shown, so nothing is cached while hidden.
+        if self._origin_offset is not None:
+            return self._origin_offset
         area = super().size()
-        scaled_w = self.pixmap.width() * self.scale
-        scaled_h = self.pixmap.height() * self.scale
-        slack_w = max(area.width() - scaled_w, 0.0)
-        slack_h = max(area.height() - scaled_h, 0.0)
-        return QPointF(slack_w, slack_h) / (2.0 * self.scale)
+        scale = self.scale
+        slack_w = max(area.width() - self._image_width * scale, 0.0)
+        slack_h = max(area.height() - self._image_height * scale, 0.0)
+        offset = (slack_w / (2.0 * scale), slack_h / (2.0 * scale))
+        if self.isVisible():
+            self._origin_offset = offset
+        return offset
 
     def is_out_of_pixmap(self, p: QPointF) -> bool:
-        return _is_out_of_image(p, self.pixmap.size())
+        return _is_out_of_image(p, self._image_size)
 
     def _should_constrain_to_pixmap(self, point: QPointF) -> bool:
         return not self._allow_out_of_bounds_points and self.is_out_of_pixmap(point)
@@ -1773,13 +2130,11 @@ class Canvas(QtWidgets.QWidget):
         raise AssertionError(f"unreachable: {self.create_mode}")
 
     def _reset_after_shape_creation(self) -> None:
-        self._polygon_hold_timer.stop()
         self._current = None
         self.new_shape.emit()
         self.update()
 
     def _cancel_current_shape(self) -> None:
-        self._polygon_hold_timer.stop()
         self._current = None
         self.drawing_polygon.emit(False)
         self.update()
@@ -1789,8 +2144,8 @@ class Canvas(QtWidgets.QWidget):
     def _compute_canvas_size(self) -> QtCore.QSize:
         if self.pixmap.isNull():
             return super().minimumSizeHint()
-        scaled_w = int(self.pixmap.width() * self.scale)
-        scaled_h = int(self.pixmap.height() * self.scale)
+        scaled_w = int(self._image_width * self.scale)
+        scaled_h = int(self._image_height * self.scale)
         viewport = self._scroll_viewport()
         if viewport is None:
             return QtCore.QSize(scaled_w, scaled_h)
@@ -1807,26 +2162,33 @@ class Canvas(QtWidgets.QWidget):
     def wheelEvent(self, a0: QtGui.QWheelEvent) -> None:
         mods: Qt.KeyboardModifier = a0.modifiers()
         delta: QPoint = a0.angleDelta()
-        if mods == Qt.KeyboardModifier.ControlModifier:
+        if mods == _CONTROL_MODIFIER:
             # with Ctrl/Command key
             # zoom
             self.zoom_request.emit(delta.y(), a0.position())
-        elif mods == Qt.KeyboardModifier.ShiftModifier and delta.x() == 0:
+        elif mods == _SHIFT_MODIFIER and delta.x() == 0:
             # Shift+wheel scrolls horizontally. macOS swaps the axis for us,
             # but Linux/Windows deliver the delta on y and expect the app to
             # remap it.
             self.scroll_request.emit(delta.y(), Qt.Orientation.Horizontal)
         else:
-            # scroll
-            self.scroll_request.emit(delta.x(), Qt.Orientation.Horizontal)
-            self.scroll_request.emit(delta.y(), Qt.Orientation.Vertical)
+            # scroll; most wheels and touchpad swipes move one axis only, so
+            # skip the other rather than emitting an empty step.
+            if delta.x() != 0:
+                self.scroll_request.emit(delta.x(), Qt.Orientation.Horizontal)
+            if delta.y() != 0:
+                self.scroll_request.emit(delta.y(), Qt.Orientation.Vertical)
         a0.accept()
 
     def _move_by_keyboard(self, offset: QPointF) -> None:
         if not self.selected_shapes:
             return
-        self._drag_shapes(shapes=self.selected_shapes, cursor=self._prev_point + offset)
-        self.update()
+        shapes = list(self.selected_shapes)
+        # Repaint where the shapes were and where they land.
+        self._update_shapes_region(shapes)
+        if self._drag_shapes(shapes=shapes, cursor=self._prev_point + offset):
+            self._shape_modified = True
+            self._update_shapes_region(shapes)
         self._is_moving_shape = True
 
     def keyPressEvent(self, a0: QtGui.QKeyEvent) -> None:
@@ -1839,7 +2201,7 @@ class Canvas(QtWidgets.QWidget):
                 key in (Qt.Key.Key_Return, Qt.Key.Key_Space) and self._can_close_shape()
             ):
                 self._finalize()
-            elif modifiers == Qt.KeyboardModifier.AltModifier:
+            elif modifiers == _ALT_MODIFIER:
                 self._snapping = False
         elif self.mode == _CanvasMode.EDIT:
             if key == Qt.Key.Key_Up:
@@ -1865,10 +2227,7 @@ class Canvas(QtWidgets.QWidget):
                 and self.selected_shapes
                 and self.selected_shapes[0] in self.shapes
             ):
-                index = self.shapes.index(self.selected_shapes[0])
-                if not np.array_equal(
-                    self.shape_backups[-1][index].points, self.shapes[index].points
-                ):
+                if self._shape_modified:
                     self.backup_shapes()
                     self.shape_moved.emit()
 
@@ -1886,6 +2245,7 @@ class Canvas(QtWidgets.QWidget):
         for shape in new_shapes:
             shape.label = text
             shape.flags = flags
+        self.mark_shapes_edited(new_shapes)
         if self.create_mode in _AI_CREATE_MODES and new_shapes:
             existing_shapes = self.shapes[: -len(new_shapes)]
             new_shapes = _automation.suppress_shapes_overlapping_existing_shapes(
@@ -1903,9 +2263,11 @@ class Canvas(QtWidgets.QWidget):
             # Remove all unlabeled shapes at the tail (added by AI in one shot)
             while self.shapes and self.shapes[-1].label is None:
                 self.shapes.pop()
+            self._invalidate_bounds()
             self._cancel_current_shape()
             return
         self._current = _shape_to_draft(self.shapes.pop()).open()
+        self._invalidate_bounds()
         if self.create_mode in POLYLINE_SHAPE_TYPES:
             self._line = dataclasses.replace(
                 self._line,
@@ -1936,13 +2298,19 @@ class Canvas(QtWidgets.QWidget):
             self._unlock_oriented_rectangle_first_edge(current=current)
             self.update()
             return
+        # The shorter outline and the rubber band from its new last vertex
+        # stay inside the old outline's bounds.
+        dirty = QtGui.QPolygonF([*current.points, *self._line.points]).boundingRect()
         current = current.pop_point()
         self._current = current
         if len(current.points) > 0:
             self._line = dataclasses.replace(
                 self._line, points=(current.points[-1],) + self._line.points[1:]
             )
-            self.update()
+            if self.create_mode in ("polygon", "linestrip"):
+                self._update_image_rect(dirty)
+            else:
+                self.update()
         else:
             self._cancel_current_shape()
 
@@ -1955,9 +2323,18 @@ class Canvas(QtWidgets.QWidget):
         self._clear_highlight_state()
 
     def load_pixmap(self, pixmap: QtGui.QPixmap, clear_shapes: bool = True) -> None:
-        pixmap_arr = _utils.img_qt_to_arr(img_qt=pixmap.toImage())
+        # cacheKey() changes whenever the pixel data does, so an equal key means
+        # the very same image is being reloaded and there is nothing to redo.
+        if (
+            not clear_shapes
+            and not pixmap.isNull()
+            and pixmap.cacheKey() == self.pixmap.cacheKey()
+        ):
+            return
         self.pixmap = pixmap
-        self._pixmap_hash = hash(pixmap_arr.tobytes())
+        self._prescaled_pixmap = None
+        self._ai_image = None
+        clear_paths_cache()
         # A new image is a fresh inference context that should surface its own
         # first failure rather than staying muted by the prior image's latch.
         self._ai_inference_failed = False
@@ -1975,7 +2352,11 @@ class Canvas(QtWidgets.QWidget):
         if shape.visible == value:
             return
         shape.visible = value
-        self.update()
+        self.mark_shapes_edited([shape])
+        self._visible_shapes_cache = None
+        self._shape_grid = None
+        self._cancel_pending_hover()
+        self._update_shapes_region([shape])
 
     def _apply_cursor(self, role: CursorRole) -> None:
         if role == self._cursor:
@@ -1997,12 +2378,19 @@ class Canvas(QtWidgets.QWidget):
     def reset_state(self) -> None:
         self._release_cursor()
         self.pixmap = QtGui.QPixmap()
-        self._pixmap_hash = None
-        self.shapes = []
+        self._ai_image = None
+        self._prescaled_pixmap = None
+        self._shapes = []
+        self._bounds_cache = {}
+        self._shape_grid = None
+        self._visible_shapes_cache = None
         self.shape_backups = collections.deque(maxlen=self._num_backups)
+        self._backup_snapshots = {}
+        self._edited_shape_ids = set()
         self._is_moving_shape = False
+        self._shape_modified = False
         self.selected_shapes = []
-        self._selected_shapes_copy = []
+        self._drag_copy_offset = None
         self._current = None
         self._highlight = None
         self._rotation_highlight = None
@@ -2072,33 +2460,35 @@ def _compute_overscroll_slack(*, scaled: int, viewport: int) -> int:
 def _compute_intersection_edges_image(
     p1: QPointF, p2: QPointF, image_size: QtCore.QSize
 ) -> QPointF:
-    width = image_size.width()
-    height = image_size.height()
+    # Runs on every drawing move: plain float math, since NumPy's per-call
+    # dispatch outweighs the arithmetic on scalars.
+    width = float(image_size.width())
+    height = float(image_size.height())
 
-    start_x = np.clip(p1.x(), 0.0, width)
-    start_y = np.clip(p1.y(), 0.0, height)
+    start_x = min(max(p1.x(), 0.0), width)
+    start_y = min(max(p1.y(), 0.0), height)
     delta_x = p2.x() - start_x
     delta_y = p2.y() - start_y
 
-    # Liang-Barsky line clipping.
-    boundary_pairs = (
-        (start_x, -delta_x),
-        (width - start_x, delta_x),
-        (start_y, -delta_y),
-        (height - start_y, delta_y),
-    )
+    # Liang-Barsky line clipping, unrolled: per axis the segment can only exit
+    # through the boundary it is heading towards.
     t_exit = 1.0
-    for numerator, denominator in boundary_pairs:
-        if denominator > 0.0:
-            t_exit = min(t_exit, numerator / denominator)
+    if delta_x < 0.0:
+        t_exit = min(t_exit, start_x / -delta_x)
+    elif delta_x > 0.0:
+        t_exit = min(t_exit, (width - start_x) / delta_x)
+    if delta_y < 0.0:
+        t_exit = min(t_exit, start_y / -delta_y)
+    elif delta_y > 0.0:
+        t_exit = min(t_exit, (height - start_y) / delta_y)
 
     if t_exit > 0.0:
         return QPointF(start_x + t_exit * delta_x, start_y + t_exit * delta_y)
 
     # t_exit == 0: start is on a boundary, p2 is exterior — slide along the edge.
     if start_x <= 0.0 or start_x >= width:
-        return QPointF(start_x, np.clip(p2.y(), 0.0, height))
-    return QPointF(np.clip(p2.x(), 0.0, width), start_y)
+        return QPointF(start_x, min(max(p2.y(), 0.0), height))
+    return QPointF(min(max(p2.x(), 0.0), width), start_y)
 
 
 def _should_reselect_on_right_press(
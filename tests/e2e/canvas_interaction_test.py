@@ -761,7 +761,7 @@ def test_right_click_on_shape_opens_context_menu(
     pause: bool,
 ) -> None:
     canvas = annotated_win._canvas_widgets.canvas
-    # No prior right-drag has populated `_selected_shapes_copy`, so the bare
+    # No prior right-drag has set `_drag_copy_offset`, so the bare
     # right-click should open the no-selection menu (the no-clipboard variant).
     # Stubbing both exec methods catches a regression that would route to the
     # selection menu.
@@ -26,6 +26,9 @@ def install_fake_osam_session(
             def run(self, **_: object) -> osam.types.GenerateResponse:
                 return response
 
+            def close(self) -> None:
+                pass
+
         monkeypatch.setattr(_ai_assist, "OsamSession", _FakeOsamSession)
         return created_model_names
 
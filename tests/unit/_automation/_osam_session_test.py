@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import osam
+import pytest
+
+from labelme._automation._osam_session import OsamSession
+
+
+class _FakeModel:
+    name = "fake"
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.encoded: list[int] = []
+
+    def encode_image(self, image: np.ndarray) -> str:
+        self.release.wait(timeout=5)
+        self.encoded.append(image.shape[0])
+        if image.shape[0] == 0:
+            raise RuntimeError("boom")
+        if image.shape[0] == 1:
+            raise NotImplementedError
+        return "embedding"
+
+
+@pytest.fixture
+def fake_model(monkeypatch: pytest.MonkeyPatch) -> _FakeModel:
+    model = _FakeModel()
+    monkeypatch.setattr(osam.apis, "get_model_type_by_name", lambda _: lambda: model)
+    return model
+
+
+def test_prefetch_embedding_encodes_in_background_once(
+    fake_model: _FakeModel,
+) -> None:
+    session = OsamSession()
+    image = np.zeros((4, 4, 3), dtype=np.uint8)
+    ready = threading.Event()
+
+    assert not session.prefetch_embedding(
+        image=image, image_id="img", on_ready=ready.set
+    )
+    assert not session.prefetch_embedding(
+        image=image, image_id="img", on_ready=ready.set
+    )
+    fake_model.release.set()
+    assert ready.wait(timeout=5)
+
+    assert session.prefetch_embedding(image=image, image_id="img", on_ready=ready.set)
+    assert session._get_or_compute_embedding(image=image, image_id="img") == (
+        "embedding"
+    )
+    assert fake_model.encoded == [4]
+
+
+def test_prefetch_embedding_reports_failure_once_until_foreground_retry(
+    fake_model: _FakeModel,
+) -> None:
+    session = OsamSession()
+    image = np.zeros((0, 4, 3), dtype=np.uint8)
+    ready = threading.Event()
+    fake_model.release.set()
+
+    assert not session.prefetch_embedding(
+        image=image, image_id="img", on_ready=ready.set
+    )
+    assert ready.wait(timeout=5)
+    with pytest.raises(RuntimeError, match="boom"):
+        session.prefetch_embedding(image=image, image_id="img", on_ready=ready.set)
+    assert session._pending_embeddings == {}
+    for _ in range(2):
+        assert not session.prefetch_embedding(
+            image=image, image_id="img", on_ready=ready.set
+        )
+    assert fake_model.encoded == [0]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        session._get_or_compute_embedding(image=image, image_id="img")
+    assert fake_model.encoded == [0, 0]
+
+
+def test_prefetch_embedding_remembers_models_without_embeddings(
+    fake_model: _FakeModel,
+) -> None:
+    session = OsamSession()
+    image = np.zeros((1, 4, 3), dtype=np.uint8)
+    ready = threading.Event()
+    fake_model.release.set()
+
+    assert not session.prefetch_embedding(
+        image=image, image_id="img", on_ready=ready.set
+    )
+    assert ready.wait(timeout=5)
+    for _ in range(2):
+        assert session.prefetch_embedding(
+            image=image, image_id="img", on_ready=ready.set
+        )
+    with pytest.raises(NotImplementedError):
+        session._get_or_compute_embedding(image=image, image_id="img")
+    assert fake_model.encoded == [1]
+
+
+def test_close_cancels_queued_embeddings(fake_model: _FakeModel) -> None:
+    session = OsamSession()
+    image = np.zeros((4, 4, 3), dtype=np.uint8)
+
+    session.prefetch_embedding(image=image, image_id="running", on_ready=lambda: None)
+    session.prefetch_embedding(image=image, image_id="queued", on_ready=lambda: None)
+    queued = session._pending_embeddings["queued"]
+
+    session.close()
+    fake_model.release.set()
+
+    assert queued.cancelled()
+    assert session._pending_embeddings == {}
+    assert session._executor is None
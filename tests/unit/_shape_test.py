@@ -266,6 +266,27 @@ def test_translate_shifts_all_points_by_offset() -> None:
         assert shape.points[i] == pytest.approx((x, y))
 
 
+def test_copy_does_not_share_mutable_state() -> None:
+    shape = _make_square_polygon()
+    shape.flags = {"occluded": False}
+    shape.mask = np.zeros((2, 2), dtype=bool)
+    shape.other_data = {"extra": {"nested": [1]}}
+
+    other = shape.copy()
+    assert other.flags is not None and other.mask is not None
+    other.points[0] = (5.0, 5.0)
+    other.point_labels[0] = 0
+    other.flags["occluded"] = True
+    other.mask[0, 0] = True
+    other.other_data["extra"]["nested"].append(2)
+
+    assert shape.points[0] == pytest.approx((0.0, 0.0))
+    assert shape.point_labels[0] == 1
+    assert shape.flags == {"occluded": False}
+    assert shape.mask is not None and not shape.mask.any()
+    assert shape.other_data == {"extra": {"nested": [1]}}
+
+
 # Edge i is the segment from points[i-1] to points[i] (roll-by-1 convention),
 # so for the square below edge 1 is the bottom and edge 0 is the left side.
 @pytest.mark.parametrize(
@@ -327,6 +348,26 @@ def test_nearest_edge_index_returns_none_for_empty_shape() -> None:
     assert index is None
 
 
+@pytest.mark.parametrize(
+    "point",
+    [(5.0, 0.0), (0.0, 5.0), (9.5, 0.3), (0.2, 0.2), (5.0, 100.0), (12.0, 11.0)],
+)
+@pytest.mark.parametrize("shape_type", ["polygon", "point"])
+def test_nearest_vertex_and_edge_index_matches_separate_lookups(
+    point: tuple[float, float], shape_type: ShapeType
+) -> None:
+    shape = _make_square_polygon()
+    shape.shape_type = shape_type
+    probe = np.array(point)
+
+    assert _shape.nearest_vertex_and_edge_index(
+        shape=shape, point=probe, scale=2.0, epsilon=3.0
+    ) == (
+        _shape.nearest_vertex_index(shape=shape, point=probe, scale=2.0, epsilon=3.0),
+        _shape.nearest_edge_index(shape=shape, point=probe, scale=2.0, epsilon=3.0),
+    )
+
+
 def test_nearest_vertex_index_returns_nearest_within_epsilon() -> None:
     shape = _make_square_polygon()
     # vertex 1 is at (10.0, 0.0); probe 0.4 units away, within epsilon=1.0
@@ -2,18 +2,23 @@ from __future__ import annotations
 
 import numpy as np
 import pytest
+from PySide6.QtCore import QRectF
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QApplication
 from PySide6.QtWidgets import QMenu
 
 from labelme._shape import Shape
+from labelme._shape import nearest_vertex_and_edge_index
+from labelme._widgets import _canvas_interaction
 from labelme._widgets._canvas_interaction import ContextMenuPair
 from labelme._widgets._canvas_interaction import CursorRole
 from labelme._widgets._canvas_interaction import HitKind
 from labelme._widgets._canvas_interaction import HitTarget
+from labelme._widgets._canvas_interaction import build_spatial_grid
 from labelme._widgets._canvas_interaction import cursor_shape_for
 from labelme._widgets._canvas_interaction import find_hover_target
 from labelme._widgets._canvas_interaction import is_within_pick_threshold
+from labelme._widgets._canvas_interaction import query_spatial_grid
 
 # Shared test constants
 _EPSILON: float = 10.0
@@ -204,6 +209,41 @@ def test_edge_not_tested_on_non_polyline_shape() -> None:
     assert result.shape is rect
 
 
+def test_edge_distance_computed_only_for_can_add_point_shapes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    measured: list[Shape] = []
+
+    def _record(
+        *, shape: Shape, point: np.ndarray, scale: float, epsilon: float
+    ) -> tuple[int | None, int | None]:
+        measured.append(shape)
+        return nearest_vertex_and_edge_index(
+            shape=shape, point=point, scale=scale, epsilon=epsilon
+        )
+
+    monkeypatch.setattr(_canvas_interaction, "nearest_vertex_and_edge_index", _record)
+    rect = Shape(
+        shape_type="rectangle",
+        points=np.array([(10, 10), (50, 50)], dtype=np.float64),
+        closed=True,
+    )
+    polygon = _polygon([(100, 100), (150, 100), (150, 150)])
+
+    result = find_hover_target(
+        shapes=[polygon, rect],
+        point=_point(30.0, 30.0),
+        scale=_SCALE,
+        epsilon=_EPSILON,
+        point_size=_POINT_SIZE,
+        priority_shape=None,
+    )
+
+    assert result is not None
+    assert result.shape is rect
+    assert measured == [polygon]
+
+
 # ---------------------------------------------------------------------------
 # find_hover_target — priority_shape ordering
 # ---------------------------------------------------------------------------
@@ -288,6 +328,47 @@ def test_reverse_paint_order_topmost_body_wins() -> None:
     assert result.shape is shape_b
 
 
+# ---------------------------------------------------------------------------
+# build_spatial_grid / query_spatial_grid
+# ---------------------------------------------------------------------------
+
+
+def test_spatial_grid_spans_every_cell_the_bounds_touch() -> None:
+    grid = build_spatial_grid(bounds=[QRectF(10, 10, 100, 20)], cell_size=64.0)
+    assert sorted(grid) == [(0, 0), (1, 0)]
+
+
+def test_query_spatial_grid_returns_only_nearby_items() -> None:
+    grid = build_spatial_grid(
+        bounds=[QRectF(0, 0, 10, 10), QRectF(500, 500, 10, 10)], cell_size=64.0
+    )
+    found = query_spatial_grid(
+        grid=grid, point=_point(5.0, 5.0), reach=_EPSILON, cell_size=64.0
+    )
+    assert found == [0]
+
+
+def test_query_spatial_grid_reach_crosses_cell_boundaries() -> None:
+    grid = build_spatial_grid(bounds=[QRectF(70, 0, 10, 10)], cell_size=64.0)
+    near = query_spatial_grid(
+        grid=grid, point=_point(60.0, 5.0), reach=_EPSILON, cell_size=64.0
+    )
+    far = query_spatial_grid(
+        grid=grid, point=_point(60.0, 5.0), reach=1.0, cell_size=64.0
+    )
+    assert near == [0]
+    assert far == []
+
+
+def test_query_spatial_grid_preserves_insertion_order() -> None:
+    bounds = [QRectF(0, 0, 10, 10)] * 3
+    grid = build_spatial_grid(bounds=bounds, cell_size=64.0)
+    found = query_spatial_grid(
+        grid=grid, point=_point(5.0, 5.0), reach=_EPSILON, cell_size=64.0
+    )
+    assert found == [0, 1, 2]
+
+
 # ---------------------------------------------------------------------------
 # is_within_pick_threshold
 # ---------------------------------------------------------------------------
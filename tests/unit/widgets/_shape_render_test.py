@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import dataclasses
+
 import numpy as np
 import pytest
+from PySide6 import QtCore
 from PySide6 import QtGui
 
 from labelme._shape import Shape
+from labelme._shape import ShapeType
 from labelme._widgets._shape_render import Palette
 from labelme._widgets._shape_render import ShapeRenderContext
+from labelme._widgets._shape_render import _build_image_path
+from labelme._widgets._shape_render import _get_shape_points_paths
+from labelme._widgets._shape_render import is_hit_by_point
 from labelme._widgets._shape_render import render_shape
+from labelme._widgets._shape_render import render_shapes
 
 _SIZE = 200
 
@@ -113,3 +121,159 @@ def test_label_anchor_tracks_scale(qapp: QtGui.QGuiApplication) -> None:
         )
         > 0
     )
+
+
+@pytest.mark.parametrize(
+    ("shape_type", "points"),
+    [
+        ("polygon", [(10, 10), (60, 10), (35, 30), (60, 50), (10, 50)]),
+        ("rectangle", [(60, 50), (10, 10)]),
+        ("oriented_rectangle", [(30, 5), (55, 30), (30, 55), (5, 30)]),
+    ],
+)
+def test_is_hit_by_point_matches_painter_path(
+    shape_type: ShapeType, points: list[tuple[float, float]]
+) -> None:
+    # Body hits skip QPainterPath, but must agree with it, edges included.
+    shape = Shape(
+        shape_type=shape_type,
+        points=np.array(points, dtype=np.float64),
+        closed=True,
+    )
+    path = _build_image_path(shape=shape)
+    for x in range(0, 70, 5):
+        for y in range(0, 60, 5):
+            hit = is_hit_by_point(
+                shape=shape,
+                point=np.array([x, y], dtype=np.float64),
+                scale=1.0,
+                point_size=8,
+                epsilon=10.0,
+            )
+            assert hit == path.contains(QtCore.QPointF(x, y)), (x, y)
+
+
+def test_shape_points_paths_are_reused_until_geometry_changes() -> None:
+    shape = _polygon(label=None)
+    context = ShapeRenderContext(
+        scale=1.0,
+        palette=Palette.from_rgb(rgb=(255, 0, 0)),
+        point_size=8,
+        point_type="round",
+        selected=False,
+        fill=False,
+        highlight=None,
+        rotation_highlight=None,
+    )
+
+    paths = _get_shape_points_paths(shape=shape, context=context)
+    assert _get_shape_points_paths(shape=shape.copy(), context=context) is paths
+
+    shape.move_vertex(i=0, pos=(40, 40))
+    moved = _get_shape_points_paths(shape=shape, context=context)
+    assert moved is not paths
+    assert moved.line.boundingRect().topLeft() == QtCore.QPointF(40, 40)
+
+
+def test_render_shapes_matches_per_shape_render_and_keeps_shared_vertices() -> None:
+    # The two squares share the vertex at (100, 100); batching their vertex
+    # markers into one path must not make the overlap cancel out.
+    palette = Palette.from_rgb(rgb=(255, 0, 0))
+    context = ShapeRenderContext(
+        scale=1.0,
+        palette=palette,
+        point_size=16,
+        point_type="round",
+        selected=False,
+        fill=False,
+        highlight=None,
+        rotation_highlight=None,
+    )
+    shapes = [
+        Shape(
+            shape_type="polygon",
+            points=np.array([[20, 20], [100, 20], [100, 100], [20, 100]]),
+            closed=True,
+        ),
+        Shape(
+            shape_type="polygon",
+            points=np.array([[100, 100], [180, 100], [180, 180], [100, 180]]),
+            closed=True,
+        ),
+    ]
+
+    def _blank() -> QtGui.QImage:
+        image = QtGui.QImage(_SIZE, _SIZE, QtGui.QImage.Format.Format_ARGB32)
+        image.fill(QtGui.QColor(255, 255, 255))
+        return image
+
+    batched = _blank()
+    painter = QtGui.QPainter(batched)
+    render_shapes(painter=painter, items=[(shape, context) for shape in shapes])
+    painter.end()
+    separate = _blank()
+    painter = QtGui.QPainter(separate)
+    for shape in shapes:
+        render_shape(painter=painter, shape=shape, context=context)
+    painter.end()
+
+    assert batched.pixelColor(104, 104) == palette.vertex_fill
+    assert batched.pixelColor(60, 20) == separate.pixelColor(60, 20)
+    assert batched.pixelColor(180, 140) == separate.pixelColor(180, 140)
+
+
+@pytest.mark.parametrize(
+    ("palette", "selected"),
+    [
+        (Palette.from_rgb(rgb=(255, 0, 0)), True),
+        (
+            dataclasses.replace(
+                Palette.from_rgb(rgb=(255, 0, 0)),
+                line=QtGui.QColor(255, 0, 0, 128),
+                vertex_fill=QtGui.QColor(255, 0, 0, 128),
+            ),
+            False,
+        ),
+    ],
+)
+def test_render_shapes_keeps_per_shape_compositing_for_mixed_colors(
+    palette: Palette, selected: bool
+) -> None:
+    # The second shape's outline crosses the first one's vertex markers, so
+    # draw order and alpha stacking show whenever the colors differ.
+    context = ShapeRenderContext(
+        scale=1.0,
+        palette=palette,
+        point_size=16,
+        point_type="round",
+        selected=selected,
+        fill=False,
+        highlight=None,
+        rotation_highlight=None,
+    )
+    shapes = [
+        Shape(
+            shape_type="polygon",
+            points=np.array([[20, 20], [100, 20], [100, 100], [20, 100]]),
+            closed=True,
+        ),
+        Shape(
+            shape_type="polygon",
+            points=np.array([[60, 100], [180, 100], [180, 180], [60, 180]]),
+            closed=True,
+        ),
+    ]
+
+    def _render(batched: bool) -> QtGui.QImage:
+        image = QtGui.QImage(_SIZE, _SIZE, QtGui.QImage.Format.Format_ARGB32)
+        image.fill(QtGui.QColor(0, 0, 0))
+        painter = QtGui.QPainter(image)
+        if batched:
+            render_shapes(painter=painter, items=[(shape, context) for shape in shapes])
+        else:
+            for shape in shapes:
+                render_shape(painter=painter, shape=shape, context=context)
+        painter.end()
+        return image
+
+    assert _render(batched=True) == _render(batched=False)
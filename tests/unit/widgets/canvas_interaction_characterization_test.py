@@ -349,7 +349,7 @@ def test_right_release_without_selection_copy_executes_menus_0(
     canvas: Canvas,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    # Without a dragged copy (_selected_shapes_copy empty), the no-selection
+    # Without a dragged copy (_drag_copy_offset unset), the no-selection
     # context menu (index 0) is executed.
     canvas.set_editing(value=True)
     canvas.scale = 1.0
@@ -373,8 +373,8 @@ def test_right_release_with_selection_copy_executes_menus_1(
     canvas: Canvas,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    # When selected shapes have been right-drag-copied (_selected_shapes_copy
-    # non-empty), the with-selection context menu (index 1) is executed.
+    # When selected shapes have been right-drag-copied (_drag_copy_offset
+    # set), the with-selection context menu (index 1) is executed.
     shape = Shape(
         shape_type="rectangle",
         points=np.array([(10, 10), (50, 40)], dtype=np.float64),
@@ -384,7 +384,7 @@ def test_right_release_with_selection_copy_executes_menus_1(
     canvas.set_editing(value=True)
     canvas.scale = 1.0
     canvas.selected_shapes = [shape]
-    canvas._selected_shapes_copy = [shape.copy()]
+    canvas._drag_copy_offset = QPointF()
     calls: list[int] = []
     monkeypatch.setattr(
         canvas.context_menus.without_selection, "exec", lambda pos=None: calls.append(0)
@@ -14,8 +14,10 @@ from PySide6.QtCore import QSize
 from PySide6.QtCore import Qt
 from pytestqt.qtbot import QtBot
 
+from labelme import _utils
 from labelme._shape import Shape
 from labelme._shape import ShapeType
+from labelme._widgets import _shape_render
 from labelme._widgets.canvas import Canvas
 from labelme._widgets.canvas import _compute_intersection_edges_image
 from labelme._widgets.canvas import _compute_overscroll_slack
@@ -82,6 +84,37 @@ def test_drag_hovered_rotation_point_does_not_drift_on_repeated_drags(
         assert canvas.shapes[0].points[i][1] == pytest.approx(y)
 
 
+@pytest.mark.gui
+def test_zero_delta_drags_do_not_mark_shape_modified(canvas: Canvas) -> None:
+    rectangle = Shape(
+        shape_type="rectangle",
+        points=np.array([(10, 10), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes(shapes=[rectangle])
+    canvas._refresh_hover_state(pos=QPointF(10, 10))
+    assert canvas._hovered_vertex == 0
+
+    canvas._drag_hovered_vertex(pos=QPointF(10, 10), is_shift_pressed=False)
+    assert not canvas._shape_modified
+    canvas._drag_hovered_vertex(pos=QPointF(12, 12), is_shift_pressed=False)
+    assert canvas._shape_modified
+
+    oriented = _make_oriented_rectangle(
+        corners=[(30, 10), (70, 10), (70, 40), (30, 40)]
+    )
+    canvas.load_shapes(shapes=[oriented])
+    canvas._shape_modified = False
+    canvas._refresh_hover_state(pos=QPointF(50, 10))
+    assert canvas._hovered_rotation == 1
+    canvas._capture_rotation_anchors()
+
+    canvas._drag_hovered_rotation_point(pos=QPointF(50, 10))
+    assert not canvas._shape_modified
+    canvas._drag_hovered_rotation_point(pos=QPointF(65, 25))
+    assert canvas._shape_modified
+
+
 @pytest.mark.gui
 def test_bounded_move_oriented_rectangle_vertex_clips_when_perpendicular_corner_outside(
     canvas: Canvas,
@@ -215,6 +248,337 @@ def test_drag_shapes_keeps_out_of_bounds_when_enabled(canvas: Canvas) -> None:
 
 
 @pytest.mark.gui
+def test_record_drag_anchor_spans_all_selected_shapes(canvas: Canvas) -> None:
+    canvas.selected_shapes = [
+        Shape(
+            shape_type="rectangle",
+            points=np.array([(40, 20), (60, 30)], dtype=np.float64),
+            closed=True,
+        ),
+        Shape(
+            shape_type="polygon",
+            points=np.array([(10, 35), (30, 25), (20, 45)], dtype=np.float64),
+            closed=True,
+        ),
+    ]
+
+    canvas._record_drag_anchor(click=QPointF(25, 30))
+
+    offset, bounds = canvas._drag_anchor
+    assert (offset.x(), offset.y()) == pytest.approx((-15, -10))
+    assert bounds.getCoords() == pytest.approx((10, 20, 60, 45))
+
+
+@pytest.mark.gui
+def test_keyboard_move_backs_up_only_when_shapes_moved(canvas: Canvas) -> None:
+    shape = Shape(
+        shape_type="rectangle",
+        points=np.array([(0, 0), (10, 10)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes(shapes=[shape])
+    canvas.selected_shapes = [shape]
+    canvas._record_drag_anchor(click=QPointF(0, 0))
+    canvas._prev_point = QPointF(0, 0)
+    release = QtGui.QKeyEvent(
+        QtCore.QEvent.Type.KeyRelease, Qt.Key.Key_Left, Qt.KeyboardModifier.NoModifier
+    )
+
+    # Already at the left edge: the move is clamped away, so nothing to undo.
+    canvas._move_by_keyboard(QPointF(-5.0, 0.0))
+    canvas.keyReleaseEvent(release)
+    assert len(canvas.shape_backups) == 1
+
+    canvas._move_by_keyboard(QPointF(5.0, 0.0))
+    canvas.keyReleaseEvent(release)
+    assert len(canvas.shape_backups) == 2
+    assert canvas.shape_backups[-1][0].points[0] == pytest.approx((5, 0))
+
+
+@pytest.mark.gui
+@pytest.mark.parametrize("copy", [True, False])
+def test_end_move_applies_right_drag_offset(canvas: Canvas, copy: bool) -> None:
+    shape = Shape(
+        shape_type="rectangle",
+        points=np.array([(10, 10), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes(shapes=[shape])
+    canvas.selected_shapes = [shape]
+    canvas._record_drag_anchor(click=QPointF(15, 15))
+    canvas._prev_point = QPointF(15, 15)
+
+    canvas._continue_right_button_drag(pos=QPointF(15, 15))
+    canvas._continue_right_button_drag(pos=QPointF(45, 20))
+    # The preview is only an offset; nothing is copied or moved yet.
+    assert canvas.shapes == [shape]
+    assert shape.points[0] == pytest.approx((10, 10))
+
+    canvas.end_move(copy=copy)
+
+    moved = canvas.selected_shapes[0]
+    assert moved.points[0] == pytest.approx((40, 15))
+    if copy:
+        assert canvas.shapes == [shape, moved]
+        assert shape.points[0] == pytest.approx((10, 10))
+    else:
+        assert canvas.shapes == [shape]
+        assert moved is shape
+
+
+@pytest.mark.gui
+def test_hover_follows_shape_after_drag(canvas: Canvas) -> None:
+    shape = Shape(
+        shape_type="rectangle",
+        points=np.array([(10, 10), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes(shapes=[shape])
+    canvas._refresh_hover_state(pos=QPointF(15, 15))
+    assert canvas.hovered_shape is shape
+
+    canvas._prev_point = QPointF(15, 15)
+    canvas._drag_anchor = (QPointF(-5, -5), QtCore.QRectF(10, 10, 10, 10))
+    assert canvas._drag_shapes(shapes=[shape], cursor=QPointF(75, 35))
+
+    # Bounds cached before the drag must not hide the shape at its new place.
+    canvas._refresh_hover_state(pos=QPointF(75, 35))
+    assert canvas.hovered_shape is shape
+    canvas._refresh_hover_state(pos=QPointF(15, 15))
+    assert canvas.hovered_shape is None
+
+
+@pytest.mark.gui
+def test_hover_moves_within_a_frame_are_coalesced(canvas: Canvas) -> None:
+    shape = Shape(
+        shape_type="rectangle",
+        points=np.array([(10, 10), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes(shapes=[shape])
+
+    canvas._schedule_hover_refresh(pos=QPointF(50, 50))
+    canvas._schedule_hover_refresh(pos=QPointF(12, 12))
+    canvas._schedule_hover_refresh(pos=QPointF(15, 15))
+    assert canvas.hovered_shape is None
+
+    # The frame tick hit-tests only the latest cursor position.
+    canvas._flush_pending_hover()
+    assert canvas.hovered_shape is shape
+    assert canvas._pending_hover_pos is None
+
+
+@pytest.mark.gui
+def test_prescaled_pixmap_is_cached_per_scale(canvas: Canvas) -> None:
+    assert canvas._get_prescaled_pixmap(dpr=1.0) is None
+
+    # Upscaling draws the source pixmap directly.
+    canvas.scale = 2.0
+    assert canvas._get_prescaled_pixmap(dpr=1.0) is None
+
+    canvas.scale = 0.5
+    prescaled = canvas._get_prescaled_pixmap(dpr=1.0)
+    assert prescaled is not None
+    assert (prescaled.width(), prescaled.height()) == (_WIDTH // 2, _HEIGHT // 2)
+    assert canvas._get_prescaled_pixmap(dpr=1.0) is prescaled
+
+    canvas.load_pixmap(QtGui.QPixmap(_WIDTH, _HEIGHT))
+    assert canvas._prescaled_pixmap is None
+
+
+@pytest.mark.gui
+@pytest.mark.parametrize(
+    ("scale", "dpr", "smooth"),
+    [(1.0, 1.0, False), (1.0, 2.0, True), (0.5, 2.0, False), (2.0, 1.0, True)],
+)
+def test_smooth_pixmap_transform_follows_device_scale(
+    canvas: Canvas, scale: float, dpr: float, smooth: bool
+) -> None:
+    canvas.scale = scale
+    device = QtGui.QImage(10, 10, QtGui.QImage.Format.Format_ARGB32)
+    device.setDevicePixelRatio(dpr)
+    painter = QtGui.QPainter(device)
+    try:
+        canvas._setup_world_transform(painter)
+        hint = QtGui.QPainter.RenderHint.SmoothPixmapTransform
+        assert bool(painter.renderHints() & hint) is smooth
+    finally:
+        painter.end()
+
+
+@pytest.mark.gui
+def test_prescaled_pixmap_renders_at_device_pixels(canvas: Canvas) -> None:
+    # At 2x DPR a 0.5 zoom maps image pixels 1:1 onto device pixels.
+    canvas.scale = 0.5
+    assert canvas._get_prescaled_pixmap(dpr=2.0) is None
+
+    canvas.scale = 0.25
+    prescaled = canvas._get_prescaled_pixmap(dpr=2.0)
+    assert prescaled is not None
+    assert (prescaled.width(), prescaled.height()) == (_WIDTH // 2, _HEIGHT // 2)
+    assert prescaled.devicePixelRatio() == 2.0
+
+
+@pytest.mark.gui
+def test_paths_cache_is_cleared_on_zoom_and_pixmap_change(canvas: Canvas) -> None:
+    shape = Shape(
+        shape_type="rectangle",
+        points=np.array([(10, 10), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes(shapes=[shape])
+
+    canvas.grab()
+    assert _shape_render._paths_cache
+    canvas.scale = canvas.scale
+    assert _shape_render._paths_cache
+
+    canvas.scale = 2.0
+    assert not _shape_render._paths_cache
+
+    canvas.grab()
+    assert _shape_render._paths_cache
+    canvas.load_pixmap(QtGui.QPixmap(_WIDTH, _HEIGHT), clear_shapes=False)
+    assert not _shape_render._paths_cache
+
+
+@pytest.mark.gui
+def test_image_origin_offset_follows_resize_zoom_and_pixmap(canvas: Canvas) -> None:
+    canvas.resize(300, 150)
+    canvas.show()
+    assert canvas._compute_image_origin_offset() == QPointF(100, 50)
+
+    canvas.resize(500, 150)
+    assert canvas._compute_image_origin_offset() == QPointF(200, 50)
+
+    canvas.scale = 2.0
+    assert canvas._compute_image_origin_offset() == QPointF(75, 12.5)
+
+    canvas.pixmap = QtGui.QPixmap(200, 50)
+    assert canvas._compute_image_origin_offset() == QPointF(25, 12.5)
+
+    canvas.hide()
+    canvas.resize(400, 100)
+    assert canvas._compute_image_origin_offset() == QPointF(0, 0)
+
+
+@pytest.mark.gui
+def test_is_out_of_pixmap_follows_pixmap_replacement(canvas: Canvas) -> None:
+    assert not canvas.is_out_of_pixmap(QPointF(_WIDTH, _HEIGHT))
+    assert canvas.is_out_of_pixmap(QPointF(_WIDTH + 1, 0))
+
+    canvas.pixmap = QtGui.QPixmap(_WIDTH * 2, _HEIGHT)
+    assert not canvas.is_out_of_pixmap(QPointF(_WIDTH + 1, 0))
+    assert canvas.is_out_of_pixmap(QPointF(-1, 0))
+
+
+@pytest.mark.gui
+def test_hover_repaints_only_the_entered_and_left_shapes(
+    canvas: Canvas, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    left = Shape(
+        shape_type="rectangle",
+        points=np.array([(10, 10), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    right = Shape(
+        shape_type="rectangle",
+        points=np.array([(70, 10), (80, 20)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes(shapes=[left, right])
+    canvas.resize(_WIDTH, _HEIGHT)
+    canvas._refresh_hover_state(pos=QPointF(15, 15))
+    updates: list[tuple[object, ...]] = []
+    monkeypatch.setattr(canvas, "update", lambda *args: updates.append(args))
+
+    canvas._refresh_hover_state(pos=QPointF(75, 15))
+
+    assert canvas.hovered_shape is right
+    rects = [args[0] for args in updates]
+    assert len(rects) == 2
+    assert all(isinstance(rect, QtCore.QRect) for rect in rects)
+    assert rects[0].contains(QtCore.QRect(10, 10, 10, 10))
+    assert rects[1].contains(QtCore.QRect(70, 10, 10, 10))
+    assert not rects[0].intersects(rects[1])
+
+
+@pytest.mark.gui
+def test_keyboard_move_repaints_old_and_new_bounds_only(
+    canvas: Canvas, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    shape = Shape(
+        shape_type="rectangle",
+        points=np.array([(10, 10), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes(shapes=[shape])
+    canvas.resize(_WIDTH, _HEIGHT)
+    canvas.selected_shapes = [shape]
+    canvas._record_drag_anchor(click=QPointF(10, 10))
+    canvas._prev_point = QPointF(10, 10)
+    updates: list[tuple[object, ...]] = []
+    monkeypatch.setattr(canvas, "update", lambda *args: updates.append(args))
+
+    canvas._move_by_keyboard(QPointF(30.0, 0.0))
+
+    rects = [args[0] for args in updates]
+    assert len(rects) == 2
+    assert all(isinstance(rect, QtCore.QRect) for rect in rects)
+    assert rects[0].contains(QtCore.QRect(10, 10, 10, 10))
+    assert rects[1].contains(QtCore.QRect(40, 10, 10, 10))
+
+
+@pytest.mark.gui
+def test_crosshair_move_repaints_only_old_and_new_lines(
+    canvas: Canvas, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    canvas.resize(_WIDTH, _HEIGHT)
+    canvas.set_editing(False)
+    canvas.create_mode = "rectangle"
+    canvas._painted_crosshair = QPointF(10, 10)
+    canvas._prev_move_point = QPointF(30, 20)
+    updates: list[tuple[object, ...]] = []
+    monkeypatch.setattr(canvas, "update", lambda *args: updates.append(args))
+
+    canvas._update_crosshair_region()
+
+    rects = [args[0] for args in updates]
+    assert rects == [
+        QtCore.QRect(0, 8, _WIDTH, 5),
+        QtCore.QRect(8, 0, 5, _HEIGHT),
+        QtCore.QRect(0, 18, _WIDTH, 5),
+        QtCore.QRect(28, 0, 5, _HEIGHT),
+    ]
+
+
+@pytest.mark.gui
+def test_center_dots_layer_marks_each_shape_center(canvas: Canvas) -> None:
+    canvas.shapes = [
+        Shape(
+            shape_type="rectangle",
+            points=np.array([(10.0, 10.0), (30.0, 30.0)]),
+        ),
+        Shape(
+            shape_type="polygon",
+            points=np.array([(60.0, 10.0), (80.0, 10.0), (80.0, 30.0), (60.0, 30.0)]),
+        ),
+        Shape(shape_type="point", points=np.array([(50.0, 40.0)])),
+    ]
+    canvas.set_show_center_dots(True)
+    image = QtGui.QImage(_WIDTH, _HEIGHT, QtGui.QImage.Format.Format_ARGB32)
+    image.fill(Qt.GlobalColor.black)
+
+    painter = QtGui.QPainter(image)
+    canvas._draw_center_dots_layer(painter)
+    painter.end()
+
+    dot = QtGui.QColor(210, 210, 0)
+    assert image.pixelColor(20, 20) == dot
+    assert image.pixelColor(70, 20) == dot
+    assert image.pixelColor(50, 40) == QtGui.QColor(Qt.GlobalColor.black)
+
+
 def test_should_draw_crosshair_off_image_when_out_of_bounds_allowed(
     canvas: Canvas,
 ) -> None:
@@ -245,6 +609,47 @@ def test_set_shape_visible_toggles_visibility(canvas: Canvas) -> None:
     assert canvas.shapes[0].visible is True
 
 
+@pytest.mark.gui
+def test_hidden_shape_is_skipped_by_hit_tests(canvas: Canvas) -> None:
+    below = Shape(
+        shape_type="rectangle",
+        points=np.array([(0, 0), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    above = Shape(
+        shape_type="rectangle",
+        points=np.array([(5, 5), (15, 15)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes([below, above])
+    assert canvas._shapes_near(QPointF(10, 10)) == [below, above]
+
+    canvas.set_shape_visible(above, False)
+    assert canvas._visible_shapes() == [below]
+    assert canvas._shapes_near(QPointF(10, 10)) == [below]
+
+
+@pytest.mark.gui
+def test_assigning_shapes_refreshes_hit_test_caches(canvas: Canvas) -> None:
+    old = Shape(
+        shape_type="rectangle",
+        points=np.array([(0, 0), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    new = Shape(
+        shape_type="rectangle",
+        points=np.array([(60, 20), (80, 40)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes([old])
+    assert canvas._shapes_near(QPointF(10, 10)) == [old]
+
+    canvas.shapes = [new]
+    assert canvas._visible_shapes() == [new]
+    assert canvas._shapes_near(QPointF(10, 10)) == []
+    assert canvas._shapes_near(QPointF(70, 30)) == [new]
+
+
 @pytest.mark.gui
 def test_shape_visibility_survives_backup_and_restore(canvas: Canvas) -> None:
     # `visible` is the one ephemeral view flag kept on the Qt-free Shape so it
@@ -266,6 +671,62 @@ def test_shape_visibility_survives_backup_and_restore(canvas: Canvas) -> None:
     assert canvas.shapes[0].visible is False
 
 
+@pytest.mark.gui
+def test_backup_shares_snapshots_of_unchanged_shapes(canvas: Canvas) -> None:
+    moved = Shape(
+        shape_type="rectangle",
+        points=np.array([(0, 0), (10, 10)], dtype=np.float64),
+        closed=True,
+    )
+    still = Shape(
+        shape_type="rectangle",
+        points=np.array([(20, 20), (30, 30)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes([moved, still])
+
+    moved.translate(offset=(5, 5))
+    canvas.mark_shapes_edited([moved])
+    canvas.backup_shapes()
+
+    before, after = canvas.shape_backups[-2], canvas.shape_backups[-1]
+    assert after[0] is not before[0]
+    assert after[1] is before[1]
+
+    # Restored shapes must not alias snapshots that older backups share.
+    canvas.restore_last_shape()
+    canvas.shapes[1].translate(offset=(1, 1))
+    assert before[1].points[0] == pytest.approx((20, 20))
+
+
+@pytest.mark.gui
+def test_canvas_edits_are_copied_into_the_next_backup(canvas: Canvas) -> None:
+    dragged = Shape(
+        shape_type="rectangle",
+        points=np.array([(10, 10), (20, 20)], dtype=np.float64),
+        closed=True,
+    )
+    hidden = Shape(
+        shape_type="rectangle",
+        points=np.array([(60, 20), (80, 40)], dtype=np.float64),
+        closed=True,
+    )
+    canvas.load_shapes([dragged, hidden])
+    canvas._refresh_hover_state(pos=QPointF(10, 10))
+    canvas._drag_hovered_vertex(pos=QPointF(12, 12), is_shift_pressed=False)
+    canvas.backup_shapes()
+
+    before, after = canvas.shape_backups[-2], canvas.shape_backups[-1]
+    assert after[0] is not before[0]
+    assert after[0].points[0] == pytest.approx((12, 12))
+    assert after[1] is before[1]
+
+    canvas.set_shape_visible(hidden, False)
+    canvas.backup_shapes()
+    assert canvas.shape_backups[-1][0] is after[0]
+    assert canvas.shape_backups[-1][1].visible is False
+
+
 @pytest.mark.gui
 @pytest.mark.parametrize("create_mode", ["ai_box_to_shape", "ai_points_to_shape"])
 def test_finalize_with_empty_inference_resets_state_and_notifies(
@@ -421,10 +882,51 @@ def test_points_preview_throttles_inference_errors_until_recovery(
     behavior["fail"] = False
     canvas._build_ai_points_preview(current=current)
     behavior["fail"] = True
+    # A successful proposal is reused until the prompt changes.
+    canvas._line = dataclasses.replace(
+        canvas._line, points=(QPointF(0, 0), QPointF(6, 6))
+    )
     canvas._build_ai_points_preview(current=current)
     assert failed == ["RuntimeError: boom", "RuntimeError: boom"]
 
 
+@pytest.mark.gui
+def test_points_preview_skips_inference_until_embedding_is_ready(
+    canvas: Canvas, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ready = {"value": False}
+    proposals: list[str] = []
+
+    def _propose(*, image_id: str, **_: object) -> list[Shape]:
+        proposals.append(image_id)
+        return []
+
+    monkeypatch.setattr(
+        canvas._ai_assist_session,
+        "prefetch_embedding",
+        lambda **_: ready["value"],
+    )
+    monkeypatch.setattr(canvas._ai_assist_session, "propose_shapes", _propose)
+    canvas.create_mode = "ai_points_to_shape"
+    canvas._line = _DraftShape(
+        shape_type="points",
+        points=(QPointF(0, 0), QPointF(5, 5)),
+        point_labels=(1, 1),
+    )
+    current = _DraftShape(
+        shape_type="points", points=(QPointF(0, 0),), point_labels=(1,)
+    )
+
+    canvas._build_ai_points_preview(current=current)
+    assert proposals == []
+
+    ready["value"] = True
+    canvas._on_ai_embedding_ready()
+    canvas._build_ai_points_preview(current=current)
+    canvas._build_ai_points_preview(current=current)
+    assert len(proposals) == 1
+
+
 @pytest.mark.gui
 def test_load_pixmap_rearms_inference_failure_report(canvas: Canvas) -> None:
     # A new image is a fresh inference context: a previous image's latched
@@ -434,6 +936,116 @@ def test_load_pixmap_rearms_inference_failure_report(canvas: Canvas) -> None:
     assert canvas._ai_inference_failed is False
 
 
+@pytest.mark.gui
+def test_ai_image_id_follows_pixmap_content(
+    canvas: Canvas, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    image_ids: list[str] = []
+
+    def _record(*, image_id: str, **_: object) -> list[Shape]:
+        image_ids.append(image_id)
+        return []
+
+    monkeypatch.setattr(canvas._ai_assist_session, "propose_shapes", _record)
+
+    def _solid_pixmap(color: Qt.GlobalColor) -> QtGui.QPixmap:
+        pixmap = QtGui.QPixmap(_WIDTH, _HEIGHT)
+        pixmap.fill(color)
+        return pixmap
+
+    for color in (Qt.GlobalColor.red, Qt.GlobalColor.red, Qt.GlobalColor.blue):
+        canvas.load_pixmap(_solid_pixmap(color))
+        canvas._shapes_from_ai_points(points=[QPointF(1, 1)], point_labels=[1])
+
+    assert image_ids[0] == image_ids[1]
+    assert image_ids[2] != image_ids[0]
+
+
+@pytest.mark.gui
+def test_deleting_canvas_closes_ai_session(qtbot: QtBot) -> None:
+    canvas = Canvas()
+    session = Mock()
+    canvas._ai_assist_session._session = session
+
+    canvas.deleteLater()
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete)
+
+    session.close.assert_called_once_with()
+
+
+@pytest.mark.gui
+def test_ai_image_is_converted_once_per_pixmap(
+    canvas: Canvas, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        canvas._ai_assist_session, "prefetch_embedding", lambda **_: False
+    )
+    conversions: list[QtGui.QImage] = []
+    img_qt_to_arr = _utils.img_qt_to_arr
+
+    def _convert(img_qt: QtGui.QImage) -> np.ndarray:
+        conversions.append(img_qt)
+        return img_qt_to_arr(img_qt=img_qt)
+
+    monkeypatch.setattr(_utils, "img_qt_to_arr", _convert)
+
+    for x in (1, 2, 3):
+        canvas._shapes_from_ai_points(
+            points=[QPointF(x, x)], point_labels=[1], wait_for_embedding=False
+        )
+    assert len(conversions) == 1
+
+    canvas.load_pixmap(QtGui.QPixmap(_WIDTH, _HEIGHT), clear_shapes=False)
+    assert canvas._ai_image is None
+    canvas._shapes_from_ai_points(
+        points=[QPointF(1, 1)], point_labels=[1], wait_for_embedding=False
+    )
+    assert len(conversions) == 2
+
+
+@pytest.mark.gui
+def test_ai_image_is_released_when_leaving_ai_modes(
+    canvas: Canvas, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        canvas._ai_assist_session, "prefetch_embedding", lambda **_: False
+    )
+
+    def _convert() -> None:
+        canvas._shapes_from_ai_points(
+            points=[QPointF(1, 1)], point_labels=[1], wait_for_embedding=False
+        )
+
+    canvas.set_editing(False)
+    canvas.create_mode = "ai_points_to_shape"
+    _convert()
+    canvas.create_mode = "ai_box_to_shape"
+    assert canvas._ai_image is not None
+    canvas.create_mode = "polygon"
+    assert canvas._ai_image is None
+
+    canvas.create_mode = "ai_points_to_shape"
+    _convert()
+    canvas.set_editing(True)
+    assert canvas._ai_image is None
+
+
+@pytest.mark.gui
+def test_load_pixmap_skips_reload_of_same_pixmap(
+    canvas: Canvas, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pixmap = QtGui.QPixmap(_WIDTH, _HEIGHT)
+    canvas.load_pixmap(pixmap)
+    updates: list[tuple[object, ...]] = []
+    monkeypatch.setattr(canvas, "update", lambda *args: updates.append(args))
+
+    canvas.load_pixmap(pixmap, clear_shapes=False)
+    assert updates == []
+
+    canvas.load_pixmap(QtGui.QPixmap(_WIDTH, _HEIGHT), clear_shapes=False)
+    assert len(updates) == 1
+
+
 @pytest.mark.gui
 def test_create_mode_switch_retypes_one_point_partial(canvas: Canvas) -> None:
     # Retype must update _current.shape_type and _line.shape_type, but must
@@ -598,6 +1210,43 @@ def test_extend_after_mode_switch_grows_partial_at_last_cursor(
         assert canvas._current.points == (QPointF(10, 10), QPointF(50, 30))
 
 
+@pytest.mark.gui
+def test_held_polygon_drag_adds_points_spaced_by_motion(canvas: Canvas) -> None:
+    canvas.set_editing(False)
+    canvas.create_mode = "polygon"
+    canvas._current = _DraftShape(
+        shape_type="polygon", points=(QPointF(10, 10),), point_labels=(1,)
+    )
+    canvas._line = _DraftShape(
+        shape_type="polygon",
+        points=(QPointF(10, 10), QPointF(10, 10)),
+        point_labels=(1, 1),
+    )
+    canvas._left_button_held = True
+
+    def move_to(x: float, y: float) -> None:
+        event = QtGui.QMouseEvent(
+            QtCore.QEvent.Type.MouseMove,
+            QPointF(x, y),
+            QPointF(x, y),
+            Qt.MouseButton.NoButton,
+            Qt.MouseButton.LeftButton,
+            Qt.KeyboardModifier.NoModifier,
+        )
+        canvas._track_drawing_cursor(pos=QPointF(x, y), event=event)
+
+    move_to(15, 10)
+    assert canvas._current is not None
+    assert canvas._current.points == (QPointF(10, 10),)
+
+    move_to(40, 10)
+    assert canvas._current.points == (QPointF(10, 10), QPointF(40, 10))
+
+    canvas._left_button_held = False
+    move_to(80, 10)
+    assert canvas._current.points == (QPointF(10, 10), QPointF(40, 10))
+
+
 @pytest.mark.parametrize(
     ("shape_type", "points", "expected"),
     [